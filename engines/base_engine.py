@@ -10,6 +10,9 @@ from go_core.board import Board
 class GoEngine(ABC):
     """Abstract base class for any Go engine."""
 
+    # False for engines that search in another process (GTP, analysis engine)
+    in_process: bool = True
+
     @abstractmethod
     def name(self) -> str:
         """Return a human-readable name of the engine."""
@@ -1,20 +1,130 @@
 # engines/baseline_mcts_engine.py
 # Baseline MCTS engine using the pure Python MCTS implementation.
 
+import threading
+from typing import Optional
+
 from go_core.board import Board
+from go_core.compact_mcts import CompactMCTS
 from go_core.mcts import MCTS
 from .base_engine import GoEngine
 
 
 class BaselineMCTSEngine(GoEngine):
-    """Baseline engine: pure MCTS, no neural network, CPU-friendly."""
+    """Baseline engine: pure MCTS, no neural network, CPU-friendly.
+
+    `workers > 1` spreads the search over that many processes, either as
+    independent trees merged at the root (parallel="root") or as rollouts
+    of one shared tree (parallel="leaf"); the pool is kept alive between
+    moves. `playout="light"` uses eye-aware rollouts that play to the end,
+    and `rave=True` turns on RAVE / AMAF move statistics.
+    `compact_tree=True` searches with the NumPy array-backed CompactMCTS
+    instead (single process, no tree reuse, no RAVE; combining it with
+    workers, parallel or rave is an error). Rollouts are scored with
+    `komi`.
+
+    `max_time_s` caps the thinking time per move and `early_stop` ends a
+    search once the best move cannot change; `last_simulations` reports
+    how many simulations the last genmove actually ran.
 
-    def __init__(self, simulations: int = 800):
+    With `ponder=True` the engine keeps searching in a background thread
+    after each genmove, on the position after its own move, until the next
+    genmove (or game end / close) stops it; the subtree under the
+    opponent's actual reply is then reused. `ponder_sims` optionally caps
+    the simulations spent per ponder. Pondering is meant for play against
+    a human or an out-of-process engine (GTP, analysis engine): the search
+    thread shares the process (and the GIL) with the caller, so against
+    another engine in the same process it takes CPU from the opponent,
+    which is why utils.tournament.play_game refuses that unless asked.
+    """
+
+    def __init__(
+        self,
+        simulations: int = 800,
+        workers: int = 1,
+        parallel: str = "root",
+        playout: str = "uniform",
+        rave: bool = False,
+        compact_tree: bool = False,
+        max_time_s: Optional[float] = None,
+        early_stop: bool = True,
+        ponder: bool = False,
+        ponder_sims: Optional[int] = None,
+        komi: float = 7.5,
+    ):
+        if compact_tree and (workers > 1 or parallel != "root" or rave):
+            raise ValueError("compact_tree runs a single-process search without RAVE (no workers, parallel or rave).")
+        if ponder and (compact_tree or (workers > 1 and parallel == "root")):
+            raise ValueError("Pondering needs the shared-tree MCTS (no compact_tree, no root parallelism).")
         self.simulations = simulations
-        self.mcts = MCTS(sims=simulations)
+        self.workers = workers
+        self.komi = komi
+        self.ponder = ponder
+        self.ponder_sims = ponder_sims
+        self._ponder_stop: Optional[threading.Event] = None
+        self._ponder_thread: Optional[threading.Thread] = None
+        if compact_tree:
+            self.mcts = CompactMCTS(
+                sims=simulations,
+                playout=playout,
+                max_time_s=max_time_s,
+                early_stop=early_stop,
+                komi=komi,
+            )
+            return
+        self.mcts = MCTS(
+            sims=simulations,
+            workers=workers,
+            parallel=parallel,
+            playout=playout,
+            rave=rave,
+            max_time_s=max_time_s,
+            early_stop=early_stop,
+            komi=komi,
+        )
+
+    @property
+    def last_simulations(self) -> int:
+        return self.mcts.last_sims
 
     def name(self) -> str:
         return f"Baseline-MCTS-{self.simulations}"
 
+    def on_game_start(self, board: Board) -> None:
+        self.stop_pondering()
+        self.mcts.reset()
+
     def genmove(self, board: Board):
-        return self.mcts.choose(board)
+        self.stop_pondering()
+        move = self.mcts.choose(board)
+        if self.ponder:
+            self._start_pondering(board, move)
+        return move
+
+    def _start_pondering(self, board: Board, move) -> None:
+        after = board.copy()
+        if not after.play(move):
+            return
+        self._ponder_stop = threading.Event()
+        self._ponder_thread = threading.Thread(
+            target=self.mcts.ponder,
+            args=(after, self._ponder_stop, self.ponder_sims),
+            daemon=True,
+        )
+        self._ponder_thread.start()
+
+    def stop_pondering(self) -> None:
+        """Stop the background search, if any, and wait for it to finish."""
+        if self._ponder_thread is None:
+            return
+        self._ponder_stop.set()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+        self._ponder_stop = None
+
+    def on_game_end(self, board: Board, result) -> None:
+        self.stop_pondering()
+
+    def close(self):
+        self.stop_pondering()
+        self.mcts.close()
@@ -0,0 +1,117 @@
+# engines/cached_engine.py
+# GoEngine wrapper that answers repeated positions from an EvalCache.
+
+from typing import Any, Optional
+
+from go_core.board import Board, PASS_MOVE, BLACK, WHITE
+from utils.eval_cache import CacheEntry, EvalCache, cache_key
+from .base_engine import GoEngine
+
+
+class CachedEngine(GoEngine):
+    """
+    Wraps any GoEngine so that positions it has already searched (same
+    position, side to move, ko ban, komi, engine id and budget) are
+    answered from an EvalCache instead of searching again.
+
+    `engine_id` must identify everything about the engine that changes its
+    moves other than the budget: model file, playout policy, RAVE, time
+    limit and so on (e.g. "katago-g170-b20c256x2" or
+    "baseline-light-rave"). name() is not enough: it is "KataGo" for every
+    model, and two engines with the same id silently share entries.
+    `budget` defaults to the engine's `simulations` / `max_visits`
+    attribute, if it has one. Besides the
+    move, the visit distribution, value and ownership are stored when the
+    engine exposes them (BaselineMCTSEngine's root statistics, the last
+    response of KataGoAnalysisEngine, converted from its
+    winrate_perspective to the side to move).
+    """
+
+    def __init__(
+        self,
+        engine: GoEngine,
+        cache: EvalCache,
+        engine_id: str,
+        budget: Any = None,
+        komi: float = 7.5,
+    ):
+        self.engine = engine
+        self.cache = cache
+        if not engine_id:
+            raise ValueError("CachedEngine needs an engine_id that identifies the engine's configuration.")
+        self.engine_id = engine_id
+        if budget is None:
+            budget = getattr(engine, "simulations", getattr(engine, "max_visits", None))
+        self.budget = budget
+        self.komi = komi
+        self.last_entry: Optional[CacheEntry] = None
+        self.last_hit = False
+
+    def name(self) -> str:
+        return self.engine.name()
+
+    @property
+    def in_process(self) -> bool:
+        return self.engine.in_process
+
+    @property
+    def ponder(self) -> bool:
+        return getattr(self.engine, "ponder", False)
+
+    def genmove(self, board: Board):
+        key = cache_key(board, self.komi, self.engine_id, self.budget)
+        entry = self.cache.get(key)
+        if entry is not None and (entry.move is PASS_MOVE or board.is_legal(entry.move)):
+            self.last_entry, self.last_hit = entry, True
+            return entry.move
+
+        move = self.engine.genmove(board)
+        entry = _describe(self.engine, board, move)
+        self.cache.put(key, entry)
+        self.last_entry, self.last_hit = entry, False
+        return move
+
+    def on_game_start(self, board: Board) -> None:
+        self.engine.on_game_start(board)
+
+    def on_game_end(self, board: Board, result: Any) -> None:
+        self.engine.on_game_end(board, result)
+
+    def close(self) -> None:
+        self.cache.flush()
+        close = getattr(self.engine, "close", None)
+        if close is not None:
+            close()
+
+
+def _describe(engine: GoEngine, board: Board, move) -> CacheEntry:
+    """CacheEntry for `move` with whatever search statistics the engine exposes."""
+    mcts = getattr(engine, "mcts", None)
+    stats = getattr(mcts, "last_stats", None)
+    if stats:
+        visits = {mv: int(n) for mv, (n, _) in stats.items()}
+        n, w = stats.get(move, (0, 0.0))
+        return CacheEntry(move, visits, w / n if n else None, None)
+
+    response = getattr(engine, "last_response", None)
+    if isinstance(response, dict):
+        visits = {}
+        for info in response.get("moveInfos", []):
+            mv = board.from_coord(info["move"])
+            if mv is PASS_MOVE or mv is not None:
+                visits[mv] = int(info.get("visits", 0))
+        # KataGo reports from the perspective set by reportAnalysisWinratesAs;
+        # the entry stores the value for the side to move, ownership for BLACK
+        perspective = getattr(engine, "winrate_perspective", "BLACK")
+        reported = {"BLACK": BLACK, "WHITE": WHITE}.get(perspective, board.to_play)
+        value = response.get("rootInfo", {}).get("winrate")
+        if value is not None:
+            value = 2.0 * value - 1.0
+            if reported != board.to_play:
+                value = -value
+        ownership = response.get("ownership")
+        if ownership is not None and reported == WHITE:
+            ownership = [-x for x in ownership]
+        return CacheEntry(move, visits, value, ownership)
+
+    return CacheEntry(move, {}, None, None)
@@ -6,6 +6,7 @@ import sys
 from typing import Optional
 
 from go_core.board import Board, PASS_MOVE, BLACK, WHITE
+from go_core.features import FeatureEncoder
 from .base_engine import GoEngine
 
 
@@ -19,6 +20,8 @@ class ELFOpenGoEngine(GoEngine):
     heuristic engine so that the rest of the framework still works.
     """
 
+    komi = 7.5  # the network is trained for this komi only
+
     def __init__(self):
         # You can adjust these paths to match your ELF build.
         sys.path.insert(0, "/home/ubuntu/ELF/build/elf")
@@ -33,6 +36,8 @@ class ELFOpenGoEngine(GoEngine):
         self.go_module = None
         self.context_opts = None
         self.game_opts = None
+        self.encoder: Optional[FeatureEncoder] = None
+        self._planes = None
 
         try:
             import _elfgames_go_inference as go_inf
@@ -59,8 +64,9 @@ class ELFOpenGoEngine(GoEngine):
 
         # NOTE:
         # A full implementation would:
-        # 1) Convert the Board object into ELF feature planes.
-        # 2) Call the ELF inference API to get policy/value.
+        # 1) Encode the board with self.encode(board): AlphaGo Zero style
+        #    feature planes (1, 17, N, N).
+        # 2) Call the ELF inference API on the planes to get policy/value.
         # 3) Optionally run an internal MCTS guided by the policy/value.
         # 4) Map the chosen move back to (row, col).
         #
@@ -68,6 +74,13 @@ class ELFOpenGoEngine(GoEngine):
         # to keep the engine usable even before full integration.
         return self._heuristic_move(board)
 
+    def encode(self, board: Board):
+        """Feature planes for `board`: 8 positions of history plus the color plane."""
+        if self.encoder is None or self.encoder.size != board.N:
+            self.encoder = FeatureEncoder(board.N, history=8, tactical=False)
+            self._planes = self.encoder.new_buffer(1)
+        return self.encoder.encode([board], out=self._planes)
+
     def _heuristic_move(self, board: Board):
         """Simple heuristic: prefer 4-4, then side, then center, then any move."""
         N = board.N
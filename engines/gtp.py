@@ -0,0 +1,250 @@
+# engines/gtp.py
+# GTP subprocess client and a pool of warm GTP engine processes.
+
+import queue
+import subprocess
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Optional, Sequence
+
+STDERR_TAIL = 50  # stderr lines an engine client keeps for diagnostics
+
+
+class GTPError(RuntimeError):
+    """The GTP engine died, hung or could not be talked to."""
+
+
+class GTPTimeout(GTPError):
+    """A GTP command got no complete response in time."""
+
+
+class GTPCommandError(GTPError):
+    """The engine answered a command with a '?' failure response."""
+
+
+def drain_stderr(stream, maxlen: int = STDERR_TAIL) -> Deque[str]:
+    """
+    Read a subprocess's stderr to the end on a daemon thread, so the
+    process never blocks writing its log; returns the deque that keeps the
+    last `maxlen` lines.
+    """
+    tail: Deque[str] = deque(maxlen=maxlen)
+    threading.Thread(target=tail.extend, args=(stream,), daemon=True).start()
+    return tail
+
+
+async def adrain_stderr(stream, tail: Deque[str]) -> None:
+    """drain_stderr() for an asyncio subprocess stream, appending decoded lines to `tail`."""
+    while True:
+        raw = await stream.readline()
+        if not raw:
+            break
+        tail.append(raw.decode(errors="replace"))
+
+
+class GTPProcess:
+    """
+    Simple GTP client wrapper around a KataGo (or other GTP) subprocess.
+
+    A response is the '=' / '?' line plus any following lines, up to the
+    blank line that terminates it. `timeout` (seconds, None = wait forever)
+    is the default per-command limit; a command that times out, or an
+    engine that exits, raises GTPError and leaves the process unhealthy,
+    since its output can no longer be matched to commands.
+    """
+
+    def __init__(self, command: Sequence[str], timeout: Optional[float] = None):
+        self.command = list(command)
+        self.timeout = timeout
+        self.broken = False
+        self.proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            bufsize=1,
+        )
+        self.stderr_tail = drain_stderr(self.proc.stderr)
+        self._q = queue.Queue()
+        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader_thread.start()
+
+    def _reader_loop(self):
+        for line in self.proc.stdout:
+            self._q.put(line)
+        self._q.put(None)  # end of output: the engine exited
+
+    @property
+    def healthy(self) -> bool:
+        return not self.broken and self.proc.poll() is None
+
+    def send(self, cmd: str, timeout: Optional[float] = None) -> str:
+        """Send a GTP command and read the response (without the blank terminator line)."""
+        if self.broken:
+            raise GTPError("GTP engine is unhealthy; restart it.")
+        if self.proc.stdin is None:
+            raise RuntimeError("GTP subprocess stdin is not available.")
+        if timeout is None:
+            timeout = self.timeout
+
+        try:
+            self.proc.stdin.write(cmd + "\n")
+            self.proc.stdin.flush()
+        except OSError as exc:
+            self.broken = True
+            raise GTPError(f"GTP engine exited (sending {cmd!r}).") from exc
+
+        lines = []
+        while True:
+            try:
+                line = self._q.get(timeout=timeout)
+            except queue.Empty:
+                self.broken = True
+                raise GTPTimeout(f"No response to {cmd!r} within {timeout}s.") from None
+            if line is None:
+                self.broken = True
+                raise GTPError(f"GTP engine exited while answering {cmd!r}.")
+            if not line.strip():
+                if lines:
+                    break
+                continue  # blank lines before a response
+            lines.append(line)
+        return "".join(lines)
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        """True if the engine answers a trivial command in time."""
+        try:
+            return self.send("name", timeout=timeout).startswith("=")
+        except GTPError:
+            return False
+
+    def close(self):
+        try:
+            if self.proc.stdin:
+                self.proc.stdin.write("quit\n")
+                self.proc.stdin.flush()
+        except Exception:
+            pass
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=3)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class GTPEnginePool:
+    """
+    Keeps `size` warm GTP processes for one engine command (e.g. one KataGo
+    model) and leases them to concurrent games.
+
+    Every process runs the `setup` commands once when it starts, so the
+    model load is paid per process, not per game. lease() hands out a
+    healthy process (waiting while all are in use); processes that crash
+    or time out are replaced with fresh ones, either on return to the pool
+    or through replace() while still leased. check() pings the idle ones.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        size: int = 1,
+        setup: Sequence[str] = (),
+        timeout: Optional[float] = 60.0,
+    ):
+        if size < 1:
+            raise ValueError("size must be positive.")
+        self.command = list(command)
+        self.setup = list(setup)
+        self.timeout = timeout
+        self.size = size
+        self.restarts = 0
+        self._closed = False
+        self._idle: "queue.Queue[GTPProcess]" = queue.Queue()
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> GTPProcess:
+        proc = GTPProcess(self.command, timeout=self.timeout)
+        try:
+            for cmd in self.setup:
+                response = proc.send(cmd)
+                if response.startswith("?"):
+                    raise GTPError(f"Setup command {cmd!r} failed: {response.strip()}")
+        except GTPError:
+            proc.close()
+            raise
+        return proc
+
+    def acquire(self, timeout: Optional[float] = None) -> GTPProcess:
+        """Take a healthy process out of the pool; release() gives it back."""
+        if self._closed:
+            raise GTPError("GTP engine pool is closed.")
+        try:
+            proc = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise GTPTimeout(f"No GTP engine free within {timeout}s.") from None
+        if not proc.healthy:
+            proc = self.replace(proc)
+        return proc
+
+    def release(self, proc: GTPProcess) -> None:
+        if self._closed:
+            proc.close()
+            return
+        if not proc.healthy:
+            proc = self.replace(proc)
+        self._idle.put(proc)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        proc = self.acquire(timeout)
+        try:
+            yield proc
+        finally:
+            self.release(proc)
+
+    def replace(self, proc: GTPProcess) -> GTPProcess:
+        """
+        Close a (crashed or hung) process and start a fresh one in its place.
+        If the new one fails to start, the dead process goes back to the
+        pool, so the slot is kept and the next acquire() retries.
+        """
+        proc.close()
+        self.restarts += 1
+        try:
+            return self._spawn()
+        except Exception:
+            if not self._closed:
+                self._idle.put(proc)
+            raise
+
+    def check(self, timeout: float = 5.0) -> int:
+        """Ping the idle processes, replace the ones that fail; return how many were replaced."""
+        procs = []
+        while True:
+            try:
+                procs.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        replaced = 0
+        for proc in procs:
+            if not proc.ping(timeout):
+                try:
+                    proc = self.replace(proc)
+                except (GTPError, OSError):
+                    continue  # back in the pool, retried on acquire
+                replaced += 1
+            self._idle.put(proc)
+        return replaced
+
+    def close(self) -> None:
+        """Stop the idle processes; leased ones are stopped when released."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,171 @@
+# engines/gtp_async.py
+# asyncio GTP client: numbered, pipelined commands without a thread per engine.
+
+import asyncio
+import itertools
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from go_core.board import Board, PASS_MOVE, BLACK
+from .gtp import STDERR_TAIL, GTPCommandError, GTPError, GTPTimeout, adrain_stderr
+
+
+class AsyncGTPClient:
+    """
+    GTP client driven by an asyncio event loop.
+
+    Every command is sent as "<id> <command>" and its response is framed
+    on the blank line that terminates it, so multi-line responses are read
+    whole and matched to their command by the echoed id (in order, for
+    engines that do not echo ids). submit() writes a command at once and
+    returns a future, so bursts such as the `play` moves of a game sync
+    are pipelined instead of waiting for each round trip.
+
+    send() returns the response text without the '=' and id; a '?'
+    response raises GTPCommandError. A command that times out, or an
+    engine that exits, raises GTPError and leaves the client unhealthy.
+
+    Create instances with `await AsyncGTPClient.start(command)`.
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process, timeout: Optional[float] = None):
+        self.proc = proc
+        self.timeout = timeout
+        self.broken = False
+        self.stderr_tail: Deque[str] = deque(maxlen=STDERR_TAIL)
+        self._ids = itertools.count(1)
+        self._pending: "OrderedDict[int, asyncio.Future]" = OrderedDict()
+        self._reader = asyncio.ensure_future(self._read_loop())
+        # Drain stderr so the engine never blocks on a full pipe
+        self._stderr = asyncio.ensure_future(adrain_stderr(proc.stderr, self.stderr_tail))
+
+    @classmethod
+    async def start(cls, command: Sequence[str], timeout: Optional[float] = None) -> "AsyncGTPClient":
+        proc = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        return cls(proc, timeout)
+
+    @property
+    def healthy(self) -> bool:
+        return not self.broken and self.proc.returncode is None
+
+    # ------------- commands -------------
+
+    def submit(self, cmd: str) -> "asyncio.Future":
+        """Write one command without waiting; the future resolves to its response."""
+        if self.broken:
+            raise GTPError("GTP engine is unhealthy; restart it.")
+        cid = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[cid] = future
+        try:
+            self.proc.stdin.write(f"{cid} {cmd}\n".encode())
+        except (OSError, RuntimeError) as exc:
+            del self._pending[cid]
+            self.broken = True
+            raise GTPError(f"GTP engine exited (sending {cmd!r}).") from exc
+        return future
+
+    async def _wait(self, future: "asyncio.Future", what: str, timeout: Optional[float]) -> str:
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.broken = True
+            raise GTPTimeout(f"No response to {what} within {timeout}s.") from None
+
+    async def send(self, cmd: str, timeout: Optional[float] = None) -> str:
+        future = self.submit(cmd)
+        await self.proc.stdin.drain()
+        return await self._wait(future, repr(cmd), self.timeout if timeout is None else timeout)
+
+    async def send_many(self, cmds: Sequence[str], timeout: Optional[float] = None) -> List[str]:
+        """Pipeline `cmds` and return their responses in order; `timeout` covers the whole burst."""
+        futures = [self.submit(cmd) for cmd in cmds]
+        await self.proc.stdin.drain()
+        what = f"{len(cmds)} pipelined commands"
+        return await self._wait(asyncio.gather(*futures), what, self.timeout if timeout is None else timeout)
+
+    async def load_game(self, board: Board, komi: float = 7.5) -> None:
+        """Set up `board`'s game (size, komi, every move) in one pipelined burst."""
+        cmds = [f"boardsize {board.N}", f"komi {komi}", "clear_board"]
+        cmds.extend(play_commands(board, board.move_history()))
+        await self.send_many(cmds)
+
+    async def genmove(self, color: int) -> str:
+        """Vertex the engine plays for `color` ('pass' / 'resign' included)."""
+        return (await self.send(f"genmove {'B' if color == BLACK else 'W'}")).strip()
+
+    # ------------- responses -------------
+
+    async def _read_loop(self) -> None:
+        lines: List[str] = []
+        while True:
+            raw = await self.proc.stdout.readline()
+            if not raw:
+                break
+            line = raw.decode(errors="replace").rstrip("\r\n")
+            if not line.strip():
+                if lines:
+                    self._deliver(lines)
+                    lines = []
+                continue
+            lines.append(line)
+        self.broken = True
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(GTPError("GTP engine exited."))
+        self._pending.clear()
+
+    def _deliver(self, lines: List[str]) -> None:
+        ok, cid, text = _parse_response(lines)
+        if cid is not None and cid in self._pending:
+            future = self._pending.pop(cid)
+        elif self._pending:
+            _, future = self._pending.popitem(last=False)
+        else:
+            return  # unsolicited output
+        if future.done():
+            return  # the caller gave up on it (timeout)
+        if ok:
+            future.set_result(text)
+        else:
+            future.set_exception(GTPCommandError(text))
+
+    async def close(self, timeout: float = 3.0) -> None:
+        if self.proc.returncode is None:
+            try:
+                self.proc.stdin.write(b"quit\n")
+                await self.proc.stdin.drain()
+                self.proc.stdin.close()
+            except (OSError, RuntimeError):
+                pass
+            try:
+                await asyncio.wait_for(self.proc.wait(), timeout)
+            except asyncio.TimeoutError:
+                self.proc.kill()
+                await self.proc.wait()
+        await asyncio.gather(self._reader, self._stderr, return_exceptions=True)
+
+
+def _parse_response(lines: List[str]) -> Tuple[bool, Optional[int], str]:
+    """(success, id or None, text) of one framed GTP response."""
+    head = lines[0]
+    ok = head.startswith("=")
+    rest = head[1:]
+    digits = len(rest) - len(rest.lstrip("0123456789"))
+    cid = int(rest[:digits]) if digits else None
+    text = "\n".join([rest[digits:].strip()] + lines[1:])
+    return ok, cid, text.strip()
+
+
+def play_commands(board: Board, moves) -> List[str]:
+    """GTP `play` commands for (player, move) pairs on `board`'s coordinates."""
+    return [
+        f"play {'B' if player == BLACK else 'W'} "
+        + ("pass" if move is PASS_MOVE else board.to_coord(*move))
+        for player, move in moves
+    ]
@@ -0,0 +1,239 @@
+# engines/katago_analysis.py
+# KataGo analysis-engine backend: many concurrent JSON queries over one process.
+
+import asyncio
+import itertools
+import json
+import logging
+import subprocess
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence
+
+from go_core.board import Board, PASS_MOVE, BLACK
+from .base_engine import GoEngine
+from .gtp import drain_stderr
+
+logger = logging.getLogger(__name__)
+
+
+class KataGoAnalysis:
+    """
+    Client for `katago analysis`, which reads one JSON query per line and
+    answers with one JSON response per analyzed turn, in any order.
+
+    query() writes a query and returns a concurrent.futures.Future that
+    resolves to the response dict (or a list of dicts, sorted by turn, when
+    several `analyze_turns` are requested); aquery() is the asyncio
+    version. Queries can be issued from many threads or games at once; a
+    reader thread matches responses to futures by id, so KataGo is free to
+    batch the searches of all outstanding queries on its side.
+
+    Example command:
+      katago analysis -model model.bin.gz -config analysis_example.cfg
+    """
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        config_path: Optional[str] = None,
+        command: Optional[Sequence[str]] = None,
+    ):
+        if command is None:
+            if model_path is None or config_path is None:
+                raise ValueError("Give model_path and config_path, or a full command.")
+            command = ["katago", "analysis", "-model", model_path, "-config", config_path]
+        self.proc = subprocess.Popen(
+            list(command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            bufsize=1,
+        )
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        # id -> (future, expected responses, responses so far)
+        self._pending: Dict[str, tuple] = {}
+        self._closed = False
+        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader_thread.start()
+        self.stderr_tail = drain_stderr(self.proc.stderr)
+
+    # ------------- queries -------------
+
+    def query(
+        self,
+        moves: Sequence[Sequence[str]],
+        board_size: int = 19,
+        komi: float = 7.5,
+        rules: str = "tromp-taylor",
+        max_visits: Optional[int] = None,
+        include_ownership: bool = False,
+        analyze_turns: Optional[Sequence[int]] = None,
+        **extra,
+    ) -> Future:
+        """
+        Analyze the position after `moves` ([["B", "Q16"], ["W", "D4"], ...]).
+
+        Extra keyword arguments are passed through as query fields (e.g.
+        includePolicy=True, overrideSettings={...}).
+        """
+        query = {
+            "moves": [list(m) for m in moves],
+            "rules": rules,
+            "komi": komi,
+            "boardXSize": board_size,
+            "boardYSize": board_size,
+        }
+        if max_visits is not None:
+            query["maxVisits"] = max_visits
+        if include_ownership:
+            query["includeOwnership"] = True
+        if analyze_turns is not None:
+            query["analyzeTurns"] = list(analyze_turns)
+        query.update(extra)
+        expected = len(analyze_turns) if analyze_turns else 1
+        return self._submit(query, expected)
+
+    def analyze(self, board: Board, **kwargs) -> Future:
+        """Analyze the current position of `board` (its full move history is sent)."""
+        return self.query(board_moves(board), board_size=board.N, **kwargs)
+
+    async def aquery(self, moves: Sequence[Sequence[str]], **kwargs) -> dict:
+        return await asyncio.wrap_future(self.query(moves, **kwargs))
+
+    async def aanalyze(self, board: Board, **kwargs) -> dict:
+        return await asyncio.wrap_future(self.analyze(board, **kwargs))
+
+    def _submit(self, query: dict, expected: int) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed or self.proc.poll() is not None:
+                raise RuntimeError("KataGo analysis process is not running.")
+            qid = str(next(self._ids))
+            query["id"] = qid
+            self._pending[qid] = (future, expected, [])
+            try:
+                self.proc.stdin.write(json.dumps(query) + "\n")
+                self.proc.stdin.flush()
+            except OSError as exc:
+                del self._pending[qid]
+                raise RuntimeError("KataGo analysis process is not accepting queries.") from exc
+        return future
+
+    # ------------- responses -------------
+
+    def _reader_loop(self) -> None:
+        for line in self.proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            self._dispatch(response)
+        self._fail_pending(RuntimeError("KataGo analysis process exited."))
+
+    def _dispatch(self, response: dict) -> None:
+        qid = response.get("id")
+        if "warning" in response:
+            # e.g. an unused query field; the query itself still runs
+            logger.warning("KataGo query %s: %s", qid, response["warning"])
+            return
+        if response.get("isDuringSearch"):
+            return  # partial result (reportDuringSearchEvery), the final one follows
+        with self._lock:
+            entry = self._pending.get(qid)
+            if entry is None:
+                return
+            future, expected, responses = entry
+            if "error" in response:
+                del self._pending[qid]
+            else:
+                responses.append(response)
+                if len(responses) < expected:
+                    return
+                del self._pending[qid]
+        if "error" in response:
+            future.set_exception(RuntimeError(f"KataGo query {qid} failed: {response['error']}"))
+        elif expected == 1:
+            future.set_result(responses[0])
+        else:
+            future.set_result(sorted(responses, key=lambda r: r.get("turnNumber", 0)))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future, _, _ in pending:
+            if not future.done():
+                future.set_exception(exc)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Let outstanding queries finish, then stop the process."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self.proc.stdin.close()  # KataGo exits once its input ends and queries are done
+            self.proc.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.terminate()
+            self.proc.wait(timeout=3)
+        self._reader_thread.join(timeout=3)
+
+
+def board_moves(board: Board) -> List[List[str]]:
+    """The game on `board` as analysis-engine moves: [["B", "D4"], ["W", "pass"], ...]."""
+    return [
+        ["B" if player == BLACK else "W", "pass" if move is PASS_MOVE else board.to_coord(*move)]
+        for player, move in board.move_history()
+    ]
+
+
+class KataGoAnalysisEngine(GoEngine):
+    """
+    GoEngine on top of a (possibly shared) KataGoAnalysis backend.
+
+    Each genmove is one query with `max_visits`; several engines, e.g. the
+    games of one evaluation run, can share a single backend and model load.
+    `winrate_perspective` must match reportAnalysisWinratesAs in the
+    analysis config ("BLACK" in the stock one, "WHITE" or "SIDETOMOVE"):
+    it says whose point of view the winrate and ownership in
+    `last_response` are given from.
+    """
+
+    in_process = False
+
+    def __init__(
+        self,
+        analysis: KataGoAnalysis,
+        max_visits: int = 400,
+        komi: float = 7.5,
+        label: str = "KataGo-analysis",
+        winrate_perspective: str = "BLACK",
+    ):
+        if winrate_perspective not in ("BLACK", "WHITE", "SIDETOMOVE"):
+            raise ValueError(f"Unknown winrate_perspective {winrate_perspective!r}.")
+        self.analysis = analysis
+        self.max_visits = max_visits
+        self.komi = komi
+        self.label = label
+        self.winrate_perspective = winrate_perspective
+        self.last_response: Optional[dict] = None
+
+    def name(self) -> str:
+        return f"{self.label}-{self.max_visits}"
+
+    def genmove(self, board: Board):
+        response = self.analysis.analyze(board, komi=self.komi, max_visits=self.max_visits).result()
+        self.last_response = response
+        infos = sorted(response.get("moveInfos", []), key=lambda info: info.get("order", 0))
+        for info in infos:
+            move = board.from_coord(info["move"])
+            if move is PASS_MOVE or (move is not None and board.is_legal(move)):
+                return move
+        return PASS_MOVE
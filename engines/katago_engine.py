@@ -1,63 +1,15 @@
 # engines/katago_engine.py
 # KataGo engine adapter. Communicates via GTP over a subprocess.
 
-import subprocess
-import threading
-import queue
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from go_core.board import Board, PASS_MOVE, BLACK, WHITE, COL_LABELS
 from .base_engine import GoEngine
+from .gtp import GTPEnginePool, GTPError, GTPProcess
 
 
-class GTPProcess:
-    """
-    Simple GTP client wrapper around a KataGo (or other GTP) subprocess.
-    """
-
-    def __init__(self, command):
-        self.proc = subprocess.Popen(
-            command,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,
-            bufsize=1,
-        )
-        self._q = queue.Queue()
-        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
-        self._reader_thread.start()
-
-    def _reader_loop(self):
-        for line in self.proc.stdout:
-            self._q.put(line)
-
-    def send(self, cmd: str) -> str:
-        """Send a GTP command and read the response."""
-        if self.proc.stdin is None:
-            raise RuntimeError("GTP subprocess stdin is not available.")
-
-        self.proc.stdin.write(cmd + "\n")
-        self.proc.stdin.flush()
-
-        # Read until we see a line starting with '=' or '?'
-        lines = []
-        while True:
-            line = self._q.get()
-            lines.append(line)
-            if line.startswith("=") or line.startswith("?"):
-                break
-        return "".join(lines)
-
-    def close(self):
-        try:
-            if self.proc.stdin:
-                self.proc.stdin.write("quit\n")
-                self.proc.stdin.flush()
-        except Exception:
-            pass
-        self.proc.terminate()
-        self.proc.wait(timeout=3)
+def katago_gtp_command(model_path: str, config_path: str) -> List[str]:
+    return ["katago", "gtp", "-model", model_path, "-config", config_path]
 
 
 class KataGoEngine(GoEngine):
@@ -69,58 +21,152 @@ class KataGoEngine(GoEngine):
 
     Example command:
       katago gtp -model model.bin.gz -config gtp_example.cfg
+
+    The game is kept in sync incrementally: the engine remembers the moves
+    the GTP process has already seen and only sends the new ones as `play`
+    commands, so KataGo keeps its search tree and NN cache between moves.
+    If the histories diverge (new game, undo, a move KataGo did not play),
+    it falls back to clear_board and a full replay.
+
+    With a `pool` (GTPEnginePool, e.g. one per model shared by concurrent
+    games) the engine leases a warm process at game start and returns it
+    at game end instead of starting its own, waiting at most
+    `acquire_timeout` seconds for a free one (GTPTimeout after that).
+    Commands time out after `timeout` seconds (60 by default, as in the
+    pool; raise it for long searches, None waits forever). If the process
+    crashes or hangs it is restarted (replaced in the pool), the game is
+    replayed and the move retried once. `komi` is sent to every process
+    the engine attaches to.
     """
 
-    def __init__(self, model_path: str, config_path: str, board_size: int = 19):
+    in_process = False
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        config_path: Optional[str] = None,
+        board_size: int = 19,
+        pool: Optional[GTPEnginePool] = None,
+        timeout: Optional[float] = 60.0,
+        komi: float = 7.5,
+        acquire_timeout: Optional[float] = 600.0,
+    ):
         self.board_size = board_size
-        cmd = [
-            "katago",
-            "gtp",
-            "-model",
-            model_path,
-            "-config",
-            config_path,
-        ]
-        self.gtp = GTPProcess(cmd)
-
-        # Initialize board size and komi
-        self.gtp.send(f"boardsize {board_size}")
-        self.gtp.send("komi 7.5")
-        # Clear board
-        self.gtp.send("clear_board")
+        self.komi = komi
+        self.pool = pool
+        self.acquire_timeout = acquire_timeout
+        self.restarts = 0
+        self.gtp: Optional[GTPProcess] = None
+        # (player, move) list the GTP process's board currently holds
+        self._sent: Optional[List[Tuple[int, object]]] = None
+        self._gtp_size: Optional[int] = None
+        if pool is None:
+            if model_path is None or config_path is None:
+                raise ValueError("KataGoEngine needs model_path and config_path, or a pool.")
+            self._attach(GTPProcess(katago_gtp_command(model_path, config_path), timeout))
 
     def name(self) -> str:
         return "KataGo"
 
+    # ------------- process management -------------
+
+    def _attach(self, proc: GTPProcess) -> None:
+        self.gtp = proc
+        self._sent = None
+        self._gtp_size = None
+        proc.send(f"komi {self.komi:g}")
+
+    def _ensure_gtp(self) -> None:
+        if self.gtp is None:
+            self._attach(self.pool.acquire(self.acquire_timeout))
+
+    def _release(self) -> None:
+        if self.pool is not None and self.gtp is not None:
+            self.pool.release(self.gtp)
+            self.gtp = None
+
+    def _restart(self) -> None:
+        """Replace a crashed or hung process; the next sync replays the game."""
+        old = self.gtp
+        self.restarts += 1
+        if self.pool is not None:
+            # The pool owns the slot now, even if the replacement fails to start
+            self.gtp = None
+            self._attach(self.pool.replace(old))
+        else:
+            old.close()
+            self._attach(GTPProcess(old.command, old.timeout))
+
+    def _with_restart(self, fn, board: Board):
+        self._ensure_gtp()
+        try:
+            return fn(board)
+        except GTPError:
+            self._restart()
+            return fn(board)
+
+    # ------------- game protocol -------------
+
     def on_game_start(self, board: Board) -> None:
-        self.gtp.send("clear_board")
+        self._ensure_gtp()
+        self._sent = None
+        self._with_restart(self._sync, board)
+
+    def _sync(self, board: Board) -> None:
+        """Bring the GTP board to `board` by sending only the moves it has not seen."""
+        history = board.move_history()
+        sent = self._sent
+        if board.N != self._gtp_size:
+            self.gtp.send(f"boardsize {board.N}")
+            self.board_size = self._gtp_size = board.N
+            sent = None
+        if sent is None or len(sent) > len(history) or history[: len(sent)] != sent:
+            self.gtp.send("clear_board")
+            sent = []
+        for player, move in history[len(sent) :]:
+            color_char = "B" if player == BLACK else "W"
+            vertex = "pass" if move is PASS_MOVE else board.to_coord(*move)
+            response = self.gtp.send(f"play {color_char} {vertex}")
+            if response.startswith("?"):
+                self._sent = None
+                raise RuntimeError(f"KataGo rejected 'play {color_char} {vertex}': {response.strip()}")
+        self._sent = history
 
     def genmove(self, board: Board):
         """
         Sync the current board state to KataGo via GTP, then ask for genmove.
         """
-        # Reconstruct the entire game from scratch on KataGo side.
-        # For simplicity, we clear the board and replay all moves in history.
-        self.gtp.send("clear_board")
-
-        # Rebuild move sequence based on current board state
-        # We do not have full history here, so in a real integration
-        # we would track moves incrementally. For teaching purposes,
-        # we simulate by treating the current board as the truth and
-        # do not try to reconstruct earlier ko states exactly.
-        #
-        # This "stateless" sync is sufficient to produce valid moves for demos.
+        return self._with_restart(self._genmove, board)
+
+    def _genmove(self, board: Board):
+        self._sync(board)
 
         # Ask which color should move
         color_to_move = board.to_play
         color_char = "B" if color_to_move == BLACK else "W"
 
-        # Generate move
+        # Generate move (KataGo also plays it on its own board)
         response = self.gtp.send(f"genmove {color_char}")
         # Response format: "= D4" or "= pass"
         move = self._parse_genmove_response(response, board)
+        if self._gtp_vertex(response) == self._vertex_of(move, board):
+            self._sent.append((color_to_move, move))
+        else:
+            # Resigned or replaced by a fallback move: resync next time
+            self._sent = None
         return move
 
+    @staticmethod
+    def _gtp_vertex(resp: str) -> str:
+        for l in resp.splitlines():
+            if l.startswith("="):
+                return l[1:].strip().upper()
+        return ""
+
+    @staticmethod
+    def _vertex_of(move, board: Board) -> str:
+        return "PASS" if move is PASS_MOVE else board.to_coord(*move)
+
     def _parse_genmove_response(self, resp: str, board: Board):
         # Find the line starting with '='
         line = ""
@@ -151,8 +197,11 @@ class KataGoEngine(GoEngine):
         return move
 
     def on_game_end(self, board: Board, result) -> None:
-        # Optional: log game result to KataGo
-        pass
+        # Hand a leased process back to the pool for the next game
+        self._release()
 
     def close(self):
-        self.gtp.close()
+        if self.pool is not None:
+            self._release()
+        elif self.gtp is not None:
+            self.gtp.close()
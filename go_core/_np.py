@@ -0,0 +1,13 @@
+# go_core/_np.py
+# Optional NumPy import shared by the array-based go_core modules.
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional for the pure-Python rules code
+    np = None
+
+
+def require_numpy(what: str) -> None:
+    """Raise ImportError naming `what` if NumPy is not installed."""
+    if np is None:
+        raise ImportError(f"{what} requires NumPy (pip install numpy).")
@@ -0,0 +1,162 @@
+# go_core/batch.py
+# K concurrent games exposed as stacked NumPy arrays, for self-play throughput.
+
+from typing import NamedTuple, Optional, Sequence
+
+from ._np import np, require_numpy
+from .board import Board, BLACK, WHITE
+from .scoring import score_batch
+
+
+class StepResult(NamedTuple):
+    """Outcome of BatchBoard.step() for every game slot."""
+
+    done: "np.ndarray"  # (K,) bool, game finished on this step (and was reset)
+    winner: "np.ndarray"  # (K,) uint8, BLACK / WHITE, 0 for draws and unfinished
+    score: "np.ndarray"  # (K,) float, black minus white score, 0 if unfinished
+
+
+class BatchBoard:
+    """
+    K independent games stepped together.
+
+    Moves and legal masks use the flat action space [0, N*N] where action
+    r * N + c is the point (r, c) and action N*N is a pass. Each game is
+    played on an incremental Board; the batch state is mirrored into
+    stacked arrays:
+
+      stones     (K, N, N) uint8   EMPTY / BLACK / WHITE
+      to_play    (K,)      uint8
+      hashes     (K,)      uint64  Zobrist keys (stones + side to move)
+      ko_points  (K,)      int32   action index of the ko ban, -1 if none
+      passes     (K,)      int32   consecutive passes
+      move_count (K,)      int32
+
+    chain_ids and liberties (K, N, N) are derived on demand.
+
+    A game finishes after two consecutive passes or `max_moves` moves; it is
+    scored with Tromp–Taylor and immediately reset to an empty board.
+    """
+
+    def __init__(
+        self,
+        num_games: int,
+        size: int = 19,
+        komi: float = 7.5,
+        max_moves: Optional[int] = None,
+        superko: bool = False,
+    ):
+        require_numpy("BatchBoard")
+        self.K = num_games
+        self.N = size
+        self.komi = komi
+        self.max_moves = max_moves if max_moves is not None else 3 * size * size
+        self.superko = superko
+        self.boards = [Board(size, superko) for _ in range(num_games)]
+
+        W = size + 2
+        self.pass_action = size * size
+        # padded point index -> action index, and back
+        self._to_action = np.full(W * W, -1, dtype=np.int32)
+        self._to_point = np.empty(size * size, dtype=np.int32)
+        for a, p in enumerate(self.boards[0].geo.points):
+            self._to_action[p] = a
+            self._to_point[a] = p
+
+        self.stones = np.zeros((num_games, size, size), dtype=np.uint8)
+        self.to_play = np.full(num_games, BLACK, dtype=np.uint8)
+        self.hashes = np.zeros(num_games, dtype=np.uint64)
+        self.ko_points = np.full(num_games, -1, dtype=np.int32)
+        self.passes = np.zeros(num_games, dtype=np.int32)
+        self.move_count = np.zeros(num_games, dtype=np.int32)
+
+    # ------------- state mirroring -------------
+
+    def _sync(self, k: int) -> None:
+        board = self.boards[k]
+        padded = np.frombuffer(board.stones, dtype=np.uint8).reshape(board.W, board.W)
+        self.stones[k] = padded[1:-1, 1:-1]
+        self.to_play[k] = board.to_play
+        self.hashes[k] = board.hash
+        self.ko_points[k] = self._to_action[board.ko_point] if board.ko_point else -1
+
+    def reset(self, games: Optional[Sequence[int]] = None) -> None:
+        """Start fresh games in the given slots (all slots by default)."""
+        for k in range(self.K) if games is None else games:
+            self.boards[k] = Board(self.N, self.superko)
+            self.passes[k] = 0
+            self.move_count[k] = 0
+            self._sync(k)
+
+    @property
+    def chain_ids(self) -> "np.ndarray":
+        """(K, N, N) int32 chain id per stone (ids are per game), 0 if empty."""
+        out = np.zeros((self.K, self.N * self.N), dtype=np.int32)
+        for k, board in enumerate(self.boards):
+            for cid, chain in board.chains.items():
+                out[k, self._to_action[list(chain.stones)]] = cid
+        return out.reshape(self.K, self.N, self.N)
+
+    @property
+    def liberties(self) -> "np.ndarray":
+        """(K, N, N) int16 liberty count of the chain at each stone, 0 if empty."""
+        out = np.zeros((self.K, self.N * self.N), dtype=np.int16)
+        for k, board in enumerate(self.boards):
+            for chain in board.chains.values():
+                out[k, self._to_action[list(chain.stones)]] = len(chain.libs)
+        return out.reshape(self.K, self.N, self.N)
+
+    def legal_mask(self) -> "np.ndarray":
+        """(K, N*N+1) bool mask of legal actions; passing is always legal."""
+        mask = np.zeros((self.K, self.pass_action + 1), dtype=bool)
+        mask[:, self.pass_action] = True
+        for k, board in enumerate(self.boards):
+            points = board.legal_points()
+            if points:
+                mask[k, self._to_action[points]] = True
+        return mask
+
+    # ------------- stepping -------------
+
+    def step(self, actions: Sequence[int]) -> StepResult:
+        """Apply one action per game; finished games are scored and reset."""
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.K,):
+            raise ValueError(f"Expected {self.K} actions, got shape {actions.shape}.")
+
+        # Validate everything first so a bad action leaves the batch untouched
+        moves = []
+        illegal = []
+        for k, a in enumerate(actions.tolist()):
+            if a == self.pass_action:
+                moves.append(None)
+                continue
+            move = None
+            if 0 <= a < self.pass_action:
+                move = self.boards[k].move_of(int(self._to_point[a]))
+            if move is None or not self.boards[k].is_legal(move):
+                illegal.append(k)
+            moves.append(move)
+        if illegal:
+            raise ValueError(f"Illegal actions in games {illegal}: {actions[illegal].tolist()}")
+
+        for k, move in enumerate(moves):
+            self.boards[k].play(move)
+            self.passes[k] = self.passes[k] + 1 if move is None else 0
+            self.move_count[k] += 1
+
+        done = (self.passes >= 2) | (self.move_count >= self.max_moves)
+        winner = np.zeros(self.K, dtype=np.uint8)
+        score = np.zeros(self.K, dtype=np.float64)
+        finished = np.flatnonzero(done)
+        if finished.size:
+            for k in finished:
+                self._sync(k)
+            black, white, _ = score_batch(self.stones[finished], self.komi)
+            margin = black - white
+            score[finished] = margin
+            winner[finished] = np.where(margin > 0, BLACK, np.where(margin < 0, WHITE, 0))
+            self.reset(finished.tolist())
+        for k in np.flatnonzero(~done):
+            self._sync(k)
+        return StepResult(done, winner, score)
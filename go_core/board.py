@@ -1,10 +1,11 @@
 # go_core/board.py
 # 19x19 Go rules with Tromp–Taylor scoring (stones + surrounded territory).
 
-from typing import List, Tuple, Optional, Set, Dict
+import random
+from typing import List, Tuple, Optional, Set, Dict, Sequence
 
 BOARD_SIZE = 19
-EMPTY, BLACK, WHITE = 0, 1, 2
+EMPTY, BLACK, WHITE, BORDER = 0, 1, 2, 3
 PASS_MOVE = None
 
 # Standard Go coordinates skip the letter 'I'
@@ -12,60 +13,260 @@ COL_LABELS = "ABCDEFGHJKLMNOPQRST"
 COL_TO_IDX = {c: i for i, c in enumerate(COL_LABELS)}
 
 
+# Zobrist keys are drawn from a fixed seed so hashes are reproducible across
+# runs and processes (they are used as cache and transposition keys).
+ZOBRIST_SEED = 20240917
+_zobrist_tables: Dict[int, List[Tuple[int, int, int]]] = {}
+_zobrist_rng = random.Random(ZOBRIST_SEED)
+ZOBRIST_WHITE_TO_PLAY = _zobrist_rng.getrandbits(64)
+
+
 def opponent(player: int) -> int:
     return BLACK if player == WHITE else WHITE
 
 
-class Board:
-    """Go board with basic rules, simple ko and Tromp–Taylor scoring."""
+# ------------- flat board geometry -------------
+#
+# Points live in a 1-D array of (N + 2) x (N + 2) cells with a one-cell
+# BORDER frame, so the point (r, c) has index (r + 1) * (N + 2) + (c + 1)
+# and its four neighbours are at fixed offsets that never leave the array.
+
+
+class Geometry:
+    """Precomputed tables shared by all boards of one size."""
+
+    __slots__ = ("N", "W", "points", "neighbors", "diagonals", "template")
+
+    def __init__(self, size: int):
+        W = size + 2
+        self.N = size
+        self.W = W
+        self.points: Tuple[int, ...] = tuple(
+            (r + 1) * W + (c + 1) for r in range(size) for c in range(size)
+        )
+        offsets = (-W, -1, 1, W)
+        diag_offsets = (-W - 1, -W + 1, W - 1, W + 1)
+        self.neighbors: List[Tuple[int, ...]] = [()] * (W * W)
+        self.diagonals: List[Tuple[int, ...]] = [()] * (W * W)
+        template = bytearray([BORDER]) * (W * W)
+        for p in self.points:
+            self.neighbors[p] = tuple(p + d for d in offsets)
+            self.diagonals[p] = tuple(p + d for d in diag_offsets)
+            template[p] = EMPTY
+        self.template = bytes(template)
+
+
+_geometries: Dict[int, Geometry] = {}
+
+
+def geometry(size: int) -> Geometry:
+    geo = _geometries.get(size)
+    if geo is None:
+        geo = _geometries[size] = Geometry(size)
+    return geo
+
+
+def zobrist_table(size: int) -> List[Tuple[int, int, int]]:
+    """Return table[p] = (0, black_key, white_key) of 64-bit keys per point index."""
+    table = _zobrist_tables.get(size)
+    if table is None:
+        rng = random.Random(ZOBRIST_SEED + size)
+        table = [(0, 0, 0)] * ((size + 2) * (size + 2))
+        for p in geometry(size).points:
+            table[p] = (0, rng.getrandbits(64), rng.getrandbits(64))
+        _zobrist_tables[size] = table
+    return table
+
+
+class Chain:
+    """A connected group of stones together with its set of liberties.
 
-    def __init__(self, size: int = BOARD_SIZE):
+    Chains are shared between a board and its copies; `owner` is the token
+    of the only board allowed to change the chain in place.
+    """
+
+    __slots__ = ("color", "stones", "libs", "owner")
+
+    def __init__(self, color: int, stones: Set[int], libs: Set[int], owner: object = None):
+        self.color = color
+        self.stones = stones
+        self.libs = libs
+        self.owner = owner
+
+    def copy(self, owner: object = None) -> "Chain":
+        return Chain(self.color, set(self.stones), set(self.libs), owner)
+
+
+# (point, player, captured points, previous ko point, previous hash);
+# point 0 stands for a pass.
+UndoRecord = Tuple[int, int, Sequence[int], int, int]
+
+
+class Board:
+    """Go board with basic rules, simple ko and Tromp–Taylor scoring.
+
+    With ``superko=True`` moves that recreate an earlier whole-board
+    position (positional superko) are illegal as well.
+    """
+
+    __slots__ = (
+        "N",
+        "W",
+        "geo",
+        "stones",
+        "to_play",
+        "hash",
+        "history",
+        "superko",
+        "seen",
+        "captured",
+        "ko_point",
+        "chain_id",
+        "chains",
+        "empty",
+        "empty_pos",
+        "undo_stack",
+        "_next_chain",
+        "_zobrist",
+        "_token",
+    )
+
+    def __init__(self, size: int = BOARD_SIZE, superko: bool = False):
         self.N: int = size
-        self.b: List[List[int]] = [[EMPTY] * size for _ in range(size)]
+        self.W: int = size + 2
+        self.geo: Geometry = geometry(size)
+        # Padded 1-D board: EMPTY / BLACK / WHITE on the board, BORDER around it
+        self.stones: bytearray = bytearray(self.geo.template)
         self.to_play: int = BLACK
-        self.history: List[Tuple] = []  # hashes for simple ko
+        # Zobrist key of stones + side to move, updated incrementally
+        self.hash: int = 0
+        self.history: List[int] = []  # Zobrist keys after each move
+        self.superko: bool = superko
+        # Positional (stones only) keys seen so far, kept in superko mode
+        self.seen: Set[int] = {0} if superko else set()
         self.captured: Dict[int, int] = {BLACK: 0, WHITE: 0}
-        self.ko: Optional[Tuple[int, int]] = None
+        self.ko_point: int = 0  # point index of the simple-ko ban, 0 if none
+        # Persistent chain structure, updated incrementally by play():
+        # chain_id[p] is 0 for empty and border points, otherwise the id of
+        # the chain in self.chains that owns the stone.
+        self.chain_id: List[int] = [0] * (self.W * self.W)
+        self.chains: Dict[int, Chain] = {}
+        # Empty points in no particular order, with empty_pos[p] = index of
+        # p in self.empty (-1 if occupied) for O(1) add/remove.
+        self.empty: List[int] = list(self.geo.points)
+        self.empty_pos: List[int] = [-1] * (self.W * self.W)
+        for i, p in enumerate(self.empty):
+            self.empty_pos[p] = i
+        # One UndoRecord per move played, consumed by pop()
+        self.undo_stack: List[UndoRecord] = []
+        self._next_chain: int = 1
+        self._zobrist = zobrist_table(size)
+        # Ownership token for copy-on-write chains, see _writable()
+        self._token: object = object()
 
     def copy(self) -> "Board":
-        nb = Board(self.N)
-        nb.b = [row[:] for row in self.b]
+        """Independent copy of the board.
+
+        Only flat buffers are copied; chains are shared and copied on first
+        write by whichever board changes them.
+        """
+        nb = Board.__new__(Board)
+        nb.N = self.N
+        nb.W = self.W
+        nb.geo = self.geo
+        nb.stones = self.stones[:]
         nb.to_play = self.to_play
+        nb.hash = self.hash
         nb.history = self.history[:]
+        nb.superko = self.superko
+        nb.seen = set(self.seen)
         nb.captured = self.captured.copy()
-        nb.ko = self.ko
+        nb.ko_point = self.ko_point
+        nb.chain_id = self.chain_id[:]
+        nb.chains = self.chains.copy()
+        nb.empty = self.empty[:]
+        nb.empty_pos = self.empty_pos[:]
+        nb.undo_stack = self.undo_stack[:]
+        nb._next_chain = self._next_chain
+        nb._zobrist = self._zobrist
+        # Neither board owns the shared chains any more
+        nb._token = object()
+        self._token = object()
         return nb
 
+    def _writable(self, cid: int) -> Chain:
+        """Chain `cid`, first copied if it is shared with another board."""
+        chain = self.chains[cid]
+        if chain.owner is not self._token:
+            chain = self.chains[cid] = chain.copy(self._token)
+        return chain
+
     # ------------- basic utilities -------------
 
+    def point(self, r: int, c: int) -> int:
+        """Flat index of (r, c)."""
+        return (r + 1) * self.W + (c + 1)
+
+    def move_of(self, p: int) -> Tuple[int, int]:
+        """(row, col) of a flat point index."""
+        return p // self.W - 1, p % self.W - 1
+
     def in_bounds(self, r: int, c: int) -> bool:
         return 0 <= r < self.N and 0 <= c < self.N
 
     def neighbors(self, r: int, c: int):
-        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-            nr, nc = r + dr, c + dc
-            if self.in_bounds(nr, nc):
-                yield nr, nc
+        for q in self.geo.neighbors[self.point(r, c)]:
+            if self.stones[q] != BORDER:
+                yield self.move_of(q)
+
+    def get(self, r: int, c: int) -> int:
+        """Colour at (r, c): EMPTY, BLACK or WHITE."""
+        return self.stones[(r + 1) * self.W + (c + 1)]
+
+    @property
+    def b(self) -> List[List[int]]:
+        """Row-major list-of-lists snapshot of the board (for inspection)."""
+        W, s = self.W, self.stones
+        return [list(s[(r + 1) * W + 1 : (r + 1) * W + 1 + self.N]) for r in range(self.N)]
+
+    @property
+    def ko(self) -> Optional[Tuple[int, int]]:
+        return self.move_of(self.ko_point) if self.ko_point else None
 
     # ------------- group + liberties -------------
 
-    def _group(self, r: int, c: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
-        """Return (stones, liberties) of the connected group at (r, c)."""
-        color = self.b[r][c]
-        assert color != EMPTY
-        q = [(r, c)]
-        stones: Set[Tuple[int, int]] = {(r, c)}
-        libs: Set[Tuple[int, int]] = set()
-        while q:
-            x, y = q.pop()
-            for nx, ny in self.neighbors(x, y):
-                v = self.b[nx][ny]
-                if v == EMPTY:
-                    libs.add((nx, ny))
-                elif v == color and (nx, ny) not in stones:
-                    stones.add((nx, ny))
-                    q.append((nx, ny))
-        return stones, libs
+    def liberties(self, r: int, c: int) -> int:
+        """Number of liberties of the chain at (r, c), 0 for an empty point."""
+        cid = self.chain_id[self.point(r, c)]
+        return len(self.chains[cid].libs) if cid else 0
+
+    def in_atari(self, r: int, c: int) -> bool:
+        """True if the stone at (r, c) belongs to a chain with one liberty."""
+        return self.liberties(r, c) == 1
+
+    def is_eye(self, move, color: int) -> bool:
+        """True if the empty point is a single-point eye of `color`."""
+        r, c = move
+        return self.get(r, c) == EMPTY and self._is_eye(self.point(r, c), color)
+
+    def _is_eye(self, p: int, color: int) -> bool:
+        stones = self.stones
+        for q in self.geo.neighbors[p]:
+            v = stones[q]
+            if v != color and v != BORDER:
+                return False
+        # False-eye test on the diagonals: an opponent stone on one diagonal
+        # is enough at the edge, two are needed in the middle of the board.
+        opp = opponent(color)
+        edge = 0
+        bad = 0
+        for q in self.geo.diagonals[p]:
+            v = stones[q]
+            if v == BORDER:
+                edge = 1
+            elif v == opp:
+                bad += 1
+        return bad + edge < 2
 
     # ------------- legality check -------------
 
@@ -74,136 +275,347 @@ class Board:
         if move is PASS_MOVE:
             return True
         r, c = move
-        if not self.in_bounds(r, c) or self.b[r][c] != EMPTY:
+        if not self.in_bounds(r, c):
             return False
-        if self.ko == (r, c):
-            return False
-
-        # Try the move on a copy of the board
-        tmp = self.copy()
-        tmp._place(r, c, tmp.to_play)
-        captured = tmp._capture_neighbors(r, c, tmp.to_play)
+        return self._is_legal_point(self.point(r, c))
 
-        # Suicide check: the new group must have liberties or capture something
-        stones, libs = tmp._group(r, c)
-        if len(libs) == 0 and captured == 0:
+    def _is_legal_point(self, p: int) -> bool:
+        if self.stones[p] != EMPTY or p == self.ko_point:
             return False
 
-        # Simple superko: avoid repeating the immediately previous position
-        if tmp._hash() in self.history[-1:]:
+        # Suicide check from the neighbouring chains alone: the move is legal
+        # if it touches an empty point, extends a chain that keeps a liberty,
+        # or captures an opponent chain that is in atari.
+        player = self.to_play
+        stones = self.stones
+        has_liberty = False
+        captures: List[int] = []
+        for q in self.geo.neighbors[p]:
+            v = stones[q]
+            if v == EMPTY:
+                has_liberty = True
+                continue
+            if v == BORDER:
+                continue
+            cid = self.chain_id[q]
+            libs = self.chains[cid].libs
+            if v == player:
+                if len(libs) > 1:
+                    has_liberty = True
+            elif len(libs) == 1 and cid not in captures:
+                captures.append(cid)
+        if not has_liberty and not captures:
             return False
-        return True
 
-    def _place(self, r: int, c: int, player: int) -> None:
-        self.b[r][c] = player
+        # Positional superko: the resulting stones must be new
+        if self.superko:
+            zob = self._zobrist
+            key = self.position_hash() ^ zob[p][player]
+            for cid in captures:
+                chain = self.chains[cid]
+                for s in chain.stones:
+                    key ^= zob[s][chain.color]
+            if key in self.seen:
+                return False
+        return True
 
-    def _capture_neighbors(self, r: int, c: int, player: int) -> int:
-        """Capture opponent groups that lose all liberties after (r, c)."""
-        cap = 0
-        opp = opponent(player)
-        checked = set()
-        for nx, ny in self.neighbors(r, c):
-            if (nx, ny) in checked:
+    def _place(self, p: int, player: int) -> List[int]:
+        """Put a stone, update chains and capture; return the captured points."""
+        stones = self.stones
+        chain_id = self.chain_id
+        chains = self.chains
+        stones[p] = player
+        self.hash ^= self._zobrist[p][player]
+        self._remove_empty(p)
+        libs: Set[int] = set()
+        own: List[int] = []
+        enemies: List[int] = []
+        for q in self.geo.neighbors[p]:
+            v = stones[q]
+            if v == EMPTY:
+                libs.add(q)
                 continue
-            checked.add((nx, ny))
-            if self.b[nx][ny] == opp:
-                stones, libs = self._group(nx, ny)
-                if len(libs) == 0:
-                    for sx, sy in stones:
-                        self.b[sx][sy] = EMPTY
-                    self.captured[player] += len(stones)
-                    cap += len(stones)
-        return cap
+            if v == BORDER:
+                continue
+            cid = chain_id[q]
+            self._writable(cid).libs.discard(p)
+            if v == player:
+                if cid not in own:
+                    own.append(cid)
+            elif cid not in enemies:
+                enemies.append(cid)
+
+        # Merge friendly chains into the largest one
+        if own:
+            own.sort(key=lambda cid: len(chains[cid].stones), reverse=True)
+            cid = own[0]
+            chain = self._writable(cid)
+            for other in own[1:]:
+                och = chains.pop(other)
+                for s in och.stones:
+                    chain_id[s] = cid
+                chain.stones |= och.stones
+                chain.libs |= och.libs
+            chain.stones.add(p)
+            chain.libs |= libs
+        else:
+            cid = self._next_chain
+            self._next_chain += 1
+            chains[cid] = Chain(player, {p}, libs, self._token)
+        chain_id[p] = cid
+
+        captured: List[int] = []
+        for eid in enemies:
+            ech = chains.get(eid)
+            if ech is not None and not ech.libs:
+                captured.extend(self._remove_chain(eid))
+        if captured:
+            self.captured[player] += len(captured)
+        return captured
+
+    def _remove_chain(self, cid: int) -> Set[int]:
+        """Remove a captured chain and give its points back as liberties."""
+        chain = self.chains.pop(cid)
+        stones = self.stones
+        chain_id = self.chain_id
+        zob = self._zobrist
+        for s in chain.stones:
+            stones[s] = EMPTY
+            chain_id[s] = 0
+            self.hash ^= zob[s][chain.color]
+            self._add_empty(s)
+        neighbors = self.geo.neighbors
+        for s in chain.stones:
+            for q in neighbors[s]:
+                nid = chain_id[q]
+                if nid:
+                    self._writable(nid).libs.add(s)
+        return chain.stones
+
+    def _build_chain(self, start: int) -> None:
+        """Flood-fill a fresh chain from a stone (used when undoing moves)."""
+        stones = self.stones
+        chain_id = self.chain_id
+        neighbors = self.geo.neighbors
+        color = stones[start]
+        cid = self._next_chain
+        self._next_chain += 1
+        members = {start}
+        libs: Set[int] = set()
+        chain_id[start] = cid
+        q = [start]
+        while q:
+            x = q.pop()
+            for n in neighbors[x]:
+                v = stones[n]
+                if v == EMPTY:
+                    libs.add(n)
+                elif v == color and n not in members:
+                    members.add(n)
+                    chain_id[n] = cid
+                    q.append(n)
+        self.chains[cid] = Chain(color, members, libs, self._token)
+
+    def _add_empty(self, p: int) -> None:
+        self.empty_pos[p] = len(self.empty)
+        self.empty.append(p)
+
+    def _remove_empty(self, p: int) -> None:
+        # Swap with the last entry so removal is O(1)
+        i = self.empty_pos[p]
+        last = self.empty.pop()
+        if last != p:
+            self.empty[i] = last
+            self.empty_pos[last] = i
+        self.empty_pos[p] = -1
 
     # ------------- playing moves -------------
 
     def play(self, move) -> bool:
-        """Apply a move; return False if illegal."""
-        if not self.is_legal(move):
-            return False
-
-        prev_hash = self._hash()
-        self.ko = None
-
-        # Pass move
+        """Apply a move; return False if illegal. The move can be undone with pop()."""
         if move is PASS_MOVE:
-            self.to_play = opponent(self.to_play)
-            self.history.append(self._hash())
+            self.undo_stack.append((0, self.to_play, (), self.ko_point, self.hash))
+            self.ko_point = 0
+            self._switch_player()
             return True
 
         r, c = move
-        self._place(r, c, self.to_play)
-        cap = self._capture_neighbors(r, c, self.to_play)
+        if not self.in_bounds(r, c):
+            return False
+        p = self.point(r, c)
+        if not self._is_legal_point(p):
+            return False
 
-        # Simple ko detection
-        if cap == 1:
-            stones, libs = self._group(r, c)
-            if len(libs) == 1:
-                (kr, kc) = next(iter(libs))
-                if self._hash() != prev_hash:
-                    self.ko = (kr, kc)
+        undo_ko, undo_hash = self.ko_point, self.hash
+        self.ko_point = 0
+        captured = self._place(p, self.to_play)
+        self.undo_stack.append((p, self.to_play, captured, undo_ko, undo_hash))
 
-        self.to_play = opponent(self.to_play)
-        self.history.append(self._hash())
+        # Simple ko: a lone stone that captured one stone and is now in atari
+        if len(captured) == 1:
+            chain = self.chains[self.chain_id[p]]
+            if len(chain.stones) == 1 and len(chain.libs) == 1:
+                self.ko_point = next(iter(chain.libs))
+
+        if self.superko:
+            self.seen.add(self.position_hash())
+        self._switch_player()
         return True
 
+    def _switch_player(self) -> None:
+        self.to_play = opponent(self.to_play)
+        self.hash ^= ZOBRIST_WHITE_TO_PLAY
+        self.history.append(self.hash)
+
+    def push(self, move) -> bool:
+        """Make half of make/unmake: play a move that pop() can take back."""
+        return self.play(move)
+
+    def pop(self):
+        """Undo the last move played and return it.
+
+        The position, ko ban, hash, history and capture counts are restored
+        exactly; only the affected chains are rebuilt, nothing is copied.
+        """
+        p, player, captured, ko_point, prev_hash = self.undo_stack.pop()
+        if p and self.superko:
+            self.seen.discard(self.position_hash())
+        self.history.pop()
+        self.to_play = player
+        self.hash = prev_hash
+        self.ko_point = ko_point
+        if not p:
+            return PASS_MOVE
+
+        stones = self.stones
+        chain_id = self.chain_id
+        neighbors = self.geo.neighbors
+
+        # Take the stone off and split what is left of its chain
+        del self.chains[chain_id[p]]
+        stones[p] = EMPTY
+        chain_id[p] = 0
+        self._add_empty(p)
+        for q in neighbors[p]:
+            v = stones[q]
+            if v == player:
+                # Stones still carrying the deleted id have not been rebuilt yet
+                if chain_id[q] not in self.chains:
+                    self._build_chain(q)
+            elif v != EMPTY and v != BORDER:
+                self._writable(chain_id[q]).libs.add(p)
+
+        # Put the captured stones back
+        if captured:
+            opp = opponent(player)
+            for s in captured:
+                stones[s] = opp
+                chain_id[s] = 0
+                self._remove_empty(s)
+            for s in captured:
+                if not chain_id[s]:
+                    self._build_chain(s)
+                for q in neighbors[s]:
+                    if stones[q] == player:
+                        self._writable(chain_id[q]).libs.discard(s)
+            self.captured[player] -= len(captured)
+        return self.move_of(p)
+
+    def move_history(self, start: int = 0) -> List[Tuple[int, Optional[Tuple[int, int]]]]:
+        """(player, move) for every move played since `start`, from the undo stack."""
+        W = self.W
+        return [
+            (player, (p // W - 1, p % W - 1) if p else PASS_MOVE)
+            for p, player, *_ in self.undo_stack[start:]
+        ]
+
+    def legal_points(self) -> List[int]:
+        """Flat indices of all legal non-pass moves, in no particular order."""
+        # Only empty points can be legal, and each one is decided from its
+        # neighbouring chains, so this never copies the board.
+        legal = self._is_legal_point
+        return [p for p in self.empty if legal(p)]
+
     def legal_moves(self):
-        moves = []
-        for r in range(self.N):
-            for c in range(self.N):
-                if self.is_legal((r, c)):
-                    moves.append((r, c))
+        """All legal moves (in no particular order) followed by PASS_MOVE."""
+        W = self.W
+        moves = [(p // W - 1, p % W - 1) for p in self.legal_points()]
         moves.append(PASS_MOVE)
         return moves
 
-    def _hash(self):
-        # Simple hash representation: board state + player to move
-        return tuple(tuple(row) for row in self.b), self.to_play
+    def random_legal_move(self, rng=random, skip_eyes: bool = False):
+        """Uniformly random legal non-pass move, or PASS_MOVE if there is none.
+
+        With ``skip_eyes`` points that would fill one of the mover's own
+        single-point eyes are not candidates either (light playouts).
+        """
+        empty = self.empty
+        empty_pos = self.empty_pos
+        player = self.to_play
+        n = len(empty)
+        while n:
+            i = rng.randrange(n)
+            p = empty[i]
+            if self._is_legal_point(p) and not (skip_eyes and self._is_eye(p, player)):
+                return self.move_of(p)
+            # Move the rejected point out of the sampling window
+            n -= 1
+            q = empty[n]
+            empty[i], empty[n] = q, p
+            empty_pos[q], empty_pos[p] = i, n
+        return PASS_MOVE
+
+    def position_hash(self) -> int:
+        """Zobrist key of the stones alone, without the side to move."""
+        if self.to_play == WHITE:
+            return self.hash ^ ZOBRIST_WHITE_TO_PLAY
+        return self.hash
 
     # ------------- scoring (Tromp–Taylor) -------------
 
     def score_tromp_taylor(self, komi: float = 7.5):
         """Return (black_score, white_score) using Tromp–Taylor area scoring."""
-        visited: Set[Tuple[int, int]] = set()
+        visited: Set[int] = set()
         black_area = 0
         white_area = 0
 
-        for r in range(self.N):
-            for c in range(self.N):
-                v = self.b[r][c]
-                if v == BLACK:
-                    black_area += 1
-                elif v == WHITE:
-                    white_area += 1
-                elif v == EMPTY and (r, c) not in visited:
-                    region, owners = self._empty_region_owners(r, c, visited)
-                    if owners == {BLACK}:
-                        black_area += len(region)
-                    elif owners == {WHITE}:
-                        white_area += len(region)
-                    # Mixed owners = neutral points
+        stones = self.stones
+        for p in self.geo.points:
+            v = stones[p]
+            if v == BLACK:
+                black_area += 1
+            elif v == WHITE:
+                white_area += 1
+            elif p not in visited:
+                region, owners = self._empty_region_owners(p, visited)
+                if owners == {BLACK}:
+                    black_area += len(region)
+                elif owners == {WHITE}:
+                    white_area += len(region)
+                # Mixed owners = neutral points
 
         black_score = black_area
         white_score = white_area + komi
         return black_score, white_score
 
-    def _empty_region_owners(
-        self, r: int, c: int, visited: Set[Tuple[int, int]]
-    ) -> Tuple[Set[Tuple[int, int]], Set[int]]:
-        q = [(r, c)]
-        region: Set[Tuple[int, int]] = {(r, c)}
-        visited.add((r, c))
+    def _empty_region_owners(self, p: int, visited: Set[int]) -> Tuple[Set[int], Set[int]]:
+        q = [p]
+        region: Set[int] = {p}
+        visited.add(p)
         owners: Set[int] = set()
+        stones = self.stones
+        neighbors = self.geo.neighbors
 
         while q:
-            x, y = q.pop()
-            for nx, ny in self.neighbors(x, y):
-                v = self.b[nx][ny]
-                if v == EMPTY and (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    region.add((nx, ny))
-                    q.append((nx, ny))
-                elif v in (BLACK, WHITE):
+            x = q.pop()
+            for n in neighbors[x]:
+                v = stones[n]
+                if v == EMPTY:
+                    if n not in visited:
+                        visited.add(n)
+                        region.add(n)
+                        q.append(n)
+                elif v != BORDER:
                     owners.add(v)
         return region, owners
 
@@ -235,7 +647,7 @@ class Board:
         for r in range(self.N):
             row_str = []
             for c in range(self.N):
-                v = self.b[r][c]
+                v = self.get(r, c)
                 if v == EMPTY:
                     row_str.append("·")
                 elif v == BLACK:
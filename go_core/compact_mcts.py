@@ -0,0 +1,207 @@
+# go_core/compact_mcts.py
+# MCTS with the tree stored as NumPy arrays (struct of arrays) instead of node objects.
+
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+from ._np import np, require_numpy
+from .board import Board, BLACK, PASS_MOVE, opponent
+from .mcts import SearchBudget, rollout
+
+
+class CompactTree:
+    """
+    Search tree in preallocated arrays that grow geometrically.
+
+    Node i has parent[i], action[i] (r * N + c, or N * N for a pass),
+    mover[i] (the player who played action[i]), visit count N[i] and total
+    value W[i] from the mover's point of view. The children of a node are
+    one contiguous block [first_child, first_child + num_children); a node
+    with num_children == 0 has not been expanded yet.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.size = 0
+        self.capacity = capacity
+        self.parent = np.empty(capacity, dtype=np.int32)
+        self.action = np.empty(capacity, dtype=np.int16)
+        self.mover = np.empty(capacity, dtype=np.uint8)
+        self.N = np.empty(capacity, dtype=np.int32)
+        self.W = np.empty(capacity, dtype=np.float64)
+        self.first_child = np.empty(capacity, dtype=np.int32)
+        self.num_children = np.empty(capacity, dtype=np.int32)
+
+    _FIELDS = ("parent", "action", "mover", "N", "W", "first_child", "num_children")
+
+    def _reserve(self, extra: int) -> None:
+        need = self.size + extra
+        if need <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < need:
+            capacity *= 2
+        for name in self._FIELDS:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def add_root(self, mover: int) -> int:
+        self._reserve(1)
+        i = self.size
+        self.parent[i] = -1
+        self.action[i] = -1
+        self.mover[i] = mover
+        self.N[i] = 0
+        self.W[i] = 0.0
+        self.first_child[i] = 0
+        self.num_children[i] = 0
+        self.size = i + 1
+        return i
+
+    def expand(self, node: int, actions: List[int], mover: int) -> None:
+        """Create the children of `node` for the given actions in one block."""
+        k = len(actions)
+        self._reserve(k)
+        lo, hi = self.size, self.size + k
+        self.parent[lo:hi] = node
+        self.action[lo:hi] = actions
+        self.mover[lo:hi] = mover
+        self.N[lo:hi] = 0
+        self.W[lo:hi] = 0.0
+        self.first_child[lo:hi] = 0
+        self.num_children[lo:hi] = 0
+        self.first_child[node] = lo
+        self.num_children[node] = k
+        self.size = hi
+
+    def children(self, node: int) -> range:
+        lo = int(self.first_child[node])
+        return range(lo, lo + int(self.num_children[node]))
+
+    def memory_bytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self._FIELDS)
+
+
+class CompactMCTS:
+    """
+    Rollout MCTS over a CompactTree.
+
+    A leaf is expanded (all its legal moves created at once, no per-node
+    move lists) once it has been visited ``expand_after`` times, and UCB
+    selection over a node's children is a single vectorized argmax.
+    Offers the same choose() / last_stats / last_sims interface as MCTS,
+    including the ``max_time_s`` and ``early_stop`` budget options.
+    """
+
+    def __init__(
+        self,
+        sims: int = 800,
+        c_puct: float = 1.4,
+        rollout_limit: int = 300,
+        playout: str = "uniform",
+        expand_after: int = 1,
+        capacity: int = 4096,
+        max_time_s: Optional[float] = None,
+        early_stop: bool = True,
+        komi: float = 7.5,
+    ):
+        require_numpy("CompactMCTS")
+        self.sims = sims
+        self.c_puct = c_puct
+        self.rollout_limit = rollout_limit
+        self.komi = komi
+        self.playout = playout
+        self.expand_after = max(1, expand_after)
+        self.capacity = capacity
+        self.max_time_s = max_time_s
+        self.early_stop = early_stop
+        self.last_sims = 0
+        self.tree = None
+        self.last_stats: Dict[object, Tuple[int, float]] = {}
+
+    def reset(self) -> None:
+        self.tree = None
+
+    def close(self) -> None:
+        pass
+
+    def _legal_actions(self, board: Board) -> List[int]:
+        N, W = board.N, board.W
+        actions = [(p // W - 1) * N + (p % W - 1) for p in board.legal_points()]
+        actions.append(N * N)
+        return actions
+
+    def choose(self, board: Board):
+        """Run simulations and return the best move for the current player."""
+        tree = CompactTree(self.capacity)
+        self.tree = tree
+        root = tree.add_root(opponent(board.to_play))
+        board = board.copy()
+        tree.expand(root, self._legal_actions(board), board.to_play)
+
+        kids = tree.children(root)
+        budget = SearchBudget(self.sims, self.max_time_s, self.early_stop)
+
+        def root_visits():
+            return tree.N[kids.start : kids.stop].tolist()
+
+        depth = len(board.undo_stack)
+        done = 0
+        while not budget.exhausted(done, root_visits):
+            path = self._select(board, root)
+            winner = rollout(board, self.playout, self.rollout_limit, self.komi)
+            while len(board.undo_stack) > depth:
+                board.pop()
+            self._backup(path, winner)
+            done += 1
+        self.last_sims = done
+
+        N = board.N
+        self.last_stats = {
+            self._move(int(tree.action[i]), N): (int(tree.N[i]), float(tree.W[i])) for i in kids
+        }
+        best = kids.start + int(np.argmax(tree.N[kids.start : kids.stop]))
+        return self._move(int(tree.action[best]), N)
+
+    @staticmethod
+    def _move(action: int, N: int):
+        return PASS_MOVE if action == N * N else divmod(action, N)
+
+    def _select(self, board: Board, root: int) -> List[int]:
+        tree = self.tree
+        N = board.N
+        node = root
+        path = [node]
+        while True:
+            k = int(tree.num_children[node])
+            if k == 0:
+                if tree.N[node] < self.expand_after:
+                    return path
+                tree.expand(node, self._legal_actions(board), board.to_play)
+                k = int(tree.num_children[node])
+            lo = int(tree.first_child[node])
+            n = tree.N[lo : lo + k]
+            unvisited = np.flatnonzero(n == 0)
+            if unvisited.size:
+                child = lo + int(unvisited[random.randrange(unvisited.size)])
+            else:
+                score = tree.W[lo : lo + k] / n + self.c_puct * np.sqrt(
+                    math.log(int(tree.N[node]) + 1) / n
+                )
+                child = lo + int(np.argmax(score))
+            board.push(self._move(int(tree.action[child]), N))
+            path.append(child)
+            node = child
+            if tree.N[node] == 0:
+                return path
+
+    def _backup(self, path: List[int], winner: int) -> None:
+        tree = self.tree
+        idx = np.asarray(path, dtype=np.int64)
+        tree.N[idx] += 1
+        if winner:
+            value = 1.0 if winner == BLACK else -1.0
+            tree.W[idx] += np.where(tree.mover[idx] == BLACK, value, -value)
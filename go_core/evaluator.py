@@ -0,0 +1,221 @@
+# go_core/evaluator.py
+# Batched position evaluators (policy priors + value) for PUCT search.
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Sequence, Tuple
+
+from ._np import np, require_numpy
+from .board import Board
+from .features import FeatureEncoder
+
+
+class Evaluator:
+    """
+    Interface of a batched leaf evaluator.
+
+    evaluate(boards) takes same-size boards and returns (priors, values):
+      priors  (B, N*N+1) float  move probabilities over the action space
+                                 r * N + c, with N*N for a pass
+      values  (B,)       float  expected outcome in [-1, 1] for the side to
+                                 move on each board
+
+    Priors do not have to be masked to legal moves; the search does that.
+    """
+
+    def evaluate(self, boards: Sequence[Board]) -> Tuple["np.ndarray", "np.ndarray"]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+# ------------- NumPy reference network -------------
+
+
+def _conv3x3(x: "np.ndarray", w: "np.ndarray", b: "np.ndarray") -> "np.ndarray":
+    """Same-padded 3x3 convolution of (B, C, N, N) with weights (O, C, 3, 3)."""
+    n = x.shape[-1]
+    padded = np.pad(x, ((0, 0), (0, 0), (1, 1), (1, 1)))
+    out = np.zeros((x.shape[0], w.shape[0], n, n), dtype=x.dtype)
+    for dy in range(3):
+        for dx in range(3):
+            out += np.einsum(
+                "bchw,oc->bohw", padded[:, :, dy : dy + n, dx : dx + n], w[:, :, dy, dx]
+            )
+    return out + b[None, :, None, None]
+
+
+class ConvEvaluator(Evaluator):
+    """
+    Small residual convolutional policy/value net evaluated with NumPy.
+
+    Input planes come from features.FeatureEncoder (`history` positions
+    plus the tactical planes), encoded into a reused buffer. A 3x3 stem is
+    followed by `blocks` residual blocks of two 3x3 convolutions; the policy head is
+    a 1x1 convolution plus a learned pass logit, the value head averages
+    the trunk spatially and applies a linear layer and tanh.
+
+    Weights are random (seeded) unless loaded with from_file(), which is
+    enough to exercise the search and batching code without a GPU.
+    """
+
+    def __init__(
+        self, size: int = 19, channels: int = 16, blocks: int = 2, seed: int = 0, history: int = 8
+    ):
+        require_numpy("ConvEvaluator")
+        self.size = size
+        self.encoder = FeatureEncoder(size, history)
+        self._buffer = self.encoder.new_buffer(1)
+        rng = np.random.default_rng(seed)
+
+        def conv(out_c, in_c, k=3):
+            scale = np.sqrt(2.0 / (in_c * k * k))
+            return (rng.standard_normal((out_c, in_c, k, k)) * scale).astype(np.float32)
+
+        self.weights = {
+            "stem_w": conv(channels, self.encoder.num_planes),
+            "stem_b": np.zeros(channels, np.float32),
+        }
+        for i in range(blocks):
+            for j in (1, 2):
+                self.weights[f"block{i}_w{j}"] = conv(channels, channels) * (0.5 if j == 2 else 1.0)
+                self.weights[f"block{i}_b{j}"] = np.zeros(channels, np.float32)
+        self.weights["policy_w"] = conv(1, channels, k=1)[:, :, 0, 0]
+        self.weights["policy_pass"] = np.zeros(1, np.float32)
+        self.weights["value_w"] = (rng.standard_normal(channels) / channels).astype(np.float32)
+        self.weights["value_b"] = np.zeros(1, np.float32)
+        self.blocks = blocks
+
+    @classmethod
+    def from_file(cls, path: str) -> "ConvEvaluator":
+        """Load weights written by save()."""
+        require_numpy("ConvEvaluator")
+        data = np.load(path)
+        blocks = sum(1 for key in data.files if key.endswith("_w1"))
+        net = cls(
+            size=int(data["size"]),
+            channels=data["stem_w"].shape[0],
+            blocks=blocks,
+            history=int(data["history"]),
+        )
+        net.weights = {key: data[key] for key in data.files if key not in ("size", "history")}
+        return net
+
+    def save(self, path: str) -> None:
+        np.savez(path, size=self.size, history=self.encoder.history, **self.weights)
+
+    def _planes(self, boards: Sequence[Board]) -> "np.ndarray":
+        if self._buffer.shape[0] < len(boards):
+            self._buffer = self.encoder.new_buffer(len(boards))
+        return self.encoder.encode(boards, out=self._buffer)
+
+    def forward(self, x: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        """Run the net on (B, C, N, N) input planes; returns (priors, values)."""
+        w = self.weights
+        h = np.maximum(_conv3x3(x, w["stem_w"], w["stem_b"]), 0.0)
+        for i in range(self.blocks):
+            r = np.maximum(_conv3x3(h, w[f"block{i}_w1"], w[f"block{i}_b1"]), 0.0)
+            r = _conv3x3(r, w[f"block{i}_w2"], w[f"block{i}_b2"])
+            h = np.maximum(h + r, 0.0)
+
+        B = x.shape[0]
+        logits = np.empty((B, self.size * self.size + 1), dtype=np.float32)
+        logits[:, :-1] = np.einsum("bchw,oc->bhw", h, w["policy_w"]).reshape(B, -1)
+        logits[:, -1] = w["policy_pass"][0]
+        logits -= logits.max(axis=1, keepdims=True)
+        priors = np.exp(logits)
+        priors /= priors.sum(axis=1, keepdims=True)
+
+        values = np.tanh(h.mean(axis=(2, 3)) @ w["value_w"] + w["value_b"][0])
+        return priors, values
+
+    def evaluate(self, boards: Sequence[Board]) -> Tuple["np.ndarray", "np.ndarray"]:
+        if boards and boards[0].N != self.size:
+            raise ValueError(f"Evaluator is for {self.size}x{self.size}, got {boards[0].N}x{boards[0].N}.")
+        return self.forward(self._planes(boards))
+
+
+# ------------- cross-search batching -------------
+
+
+class InferenceQueue(Evaluator):
+    """
+    Collects evaluation requests from many searches into shared batches.
+
+    submit() queues one board and returns a Future of (priors, value); a
+    background thread waits for the first request, then for up to
+    `max_wait_s` more or until `max_batch_size` requests are queued, and
+    evaluates them in one call of the wrapped evaluator. Several MCTS
+    instances (e.g. concurrent games on threads) can share one queue by
+    using it as their evaluator. Boards must not be modified until their
+    result is ready.
+    """
+
+    def __init__(self, evaluator: Evaluator, max_batch_size: int = 32, max_wait_s: float = 0.002):
+        self.evaluator = evaluator
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_s = max_wait_s
+        self.batches = 0
+        self.evaluated = 0
+        self._requests: "queue.Queue[Optional[Tuple[Board, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.evaluated / self.batches if self.batches else 0.0
+
+    def submit(self, board: Board) -> Future:
+        if not self._thread.is_alive():
+            raise RuntimeError("InferenceQueue is closed.")
+        future: Future = Future()
+        self._requests.put((board, future))
+        return future
+
+    def evaluate(self, boards: Sequence[Board]) -> Tuple["np.ndarray", "np.ndarray"]:
+        futures = [self.submit(board) for board in boards]
+        results = [f.result() for f in futures]
+        priors = np.stack([p for p, _ in results])
+        values = np.array([v for _, v in results], dtype=np.float64)
+        return priors, values
+
+    def _run(self) -> None:
+        closing = False
+        while not closing:
+            item = self._requests.get()
+            if item is None:
+                break
+            batch: List[Tuple[Board, Future]] = [item]
+            deadline = time.perf_counter() + self.max_wait_s
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = self._requests.get(timeout=timeout) if timeout > 0 else self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            self._evaluate_batch(batch)
+
+    def _evaluate_batch(self, batch: List[Tuple[Board, Future]]) -> None:
+        try:
+            priors, values = self.evaluator.evaluate([board for board, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.evaluated += len(batch)
+        for i, (_, future) in enumerate(batch):
+            future.set_result((priors[i], float(values[i])))
+
+    def close(self) -> None:
+        """Finish the queued requests and stop the batching thread."""
+        if self._thread.is_alive():
+            self._requests.put(None)
+            self._thread.join()
@@ -0,0 +1,162 @@
+# go_core/features.py
+# Network input planes (AlphaGo Zero / KataGo style) encoded with NumPy.
+
+from typing import Optional, Sequence
+
+from ._np import np, require_numpy
+from .board import Board, EMPTY, BLACK, opponent
+
+
+class HistoryBuffer:
+    """
+    Rolling buffer of the last `length` positions of one game.
+
+    Call push(board) after every move (and once for the starting position);
+    each push copies the padded stone array into a ring slot, so encoding
+    never has to replay or unwind the game.
+    """
+
+    def __init__(self, size: int = 19, length: int = 8):
+        require_numpy("go_core.features")
+        W = size + 2
+        self.size = size
+        self.length = length
+        self.ring = np.zeros((length, W * W), dtype=np.uint8)
+        self.head = -1
+        self.count = 0
+        self.hash: Optional[int] = None  # hash of the newest position
+
+    def reset(self) -> None:
+        self.head = -1
+        self.count = 0
+        self.hash = None
+
+    def push(self, board: Board) -> None:
+        self.head = (self.head + 1) % self.length
+        self.ring[self.head] = np.frombuffer(board.stones, dtype=np.uint8)
+        self.count = min(self.count + 1, self.length)
+        self.hash = board.hash
+
+    def frames_into(self, out: "np.ndarray") -> None:
+        """Write the positions newest first into (length, W*W); older than the game start are empty."""
+        k = self.count
+        order = (self.head - np.arange(k)) % self.length
+        out[:k] = self.ring[order]
+        out[k:] = EMPTY
+
+
+def _unwind_into(board: Board, out: "np.ndarray") -> None:
+    """Recent positions newest first, by undoing the last moves of the undo stack."""
+    out[0] = np.frombuffer(board.stones, dtype=np.uint8)
+    undo = board.undo_stack
+    depth = min(len(out) - 1, len(undo))
+    for k in range(1, depth + 1):
+        p, player, captured, _, _ = undo[-k]
+        prev = out[k]
+        prev[:] = out[k - 1]
+        if p:
+            prev[p] = EMPTY
+            if captured:
+                prev[list(captured)] = opponent(player)
+    out[depth + 1 :] = EMPTY
+
+
+class FeatureEncoder:
+    """
+    Encodes boards into float32 planes of shape (B, C, N, N).
+
+    Planes, from the point of view of the side to move:
+      0 .. 2H-1    own / opponent stones for the last H positions,
+                   newest first (2k own, 2k+1 opponent)
+      2H           side to move is black (all ones / all zeros)
+    With ``tactical`` (KataGo-style extras) there are also:
+      2H+1 .. 2H+4 stones whose chain has 1, 2, 3, >= 4 liberties
+      2H+5         simple-ko ban point
+      2H+6         ones (on-board mask)
+
+    ``history=8, tactical=False`` gives the 17 AlphaGo Zero planes.
+    History comes from a HistoryBuffer per board when given, otherwise it
+    is rebuilt from the last H - 1 undo records of each board.
+    """
+
+    def __init__(self, size: int = 19, history: int = 8, tactical: bool = True):
+        require_numpy("go_core.features")
+        if history < 1:
+            raise ValueError("history must be at least 1.")
+        self.size = size
+        self.history = history
+        self.tactical = tactical
+        self.color_plane = 2 * history
+        self.liberty_planes = 2 * history + 1
+        self.ko_plane = 2 * history + 5
+        self.ones_plane = 2 * history + 6
+        self.num_planes = 2 * history + (7 if tactical else 1)
+
+    def new_buffer(self, batch: int) -> "np.ndarray":
+        return np.zeros((batch, self.num_planes, self.size, self.size), dtype=np.float32)
+
+    def encode(
+        self,
+        boards: Sequence[Board],
+        out: Optional["np.ndarray"] = None,
+        histories: Optional[Sequence[Optional[HistoryBuffer]]] = None,
+    ) -> "np.ndarray":
+        """
+        Encode same-size boards into `out` (allocated if None) and return
+        out[:len(boards)]. `out` must have shape (>= B, C, N, N).
+        """
+        B = len(boards)
+        N, H = self.size, self.history
+        W = N + 2
+        if out is None:
+            out = self.new_buffer(B)
+        elif out.shape[0] < B or out.shape[1:] != (self.num_planes, N, N):
+            raise ValueError(f"Buffer of shape {out.shape} cannot hold {B} x {self.num_planes} x {N} x {N}.")
+        x = out[:B]
+
+        frames = np.empty((B, H, W * W), dtype=np.uint8)
+        to_play = np.empty(B, dtype=np.uint8)
+        libs: Optional["np.ndarray"] = None
+        ko: Optional["np.ndarray"] = None
+        if self.tactical:
+            libs = np.zeros((B, W * W), dtype=np.int16)
+            ko = np.zeros((B, W * W), dtype=bool)
+        for i, board in enumerate(boards):
+            if board.N != N:
+                raise ValueError(f"Encoder is for {N}x{N}, got {board.N}x{board.N}.")
+            hist = histories[i] if histories is not None else None
+            if hist is not None:
+                if hist.hash != board.hash:
+                    raise ValueError(f"History buffer {i} is not at the board's position.")
+                hist.frames_into(frames[i])
+            else:
+                _unwind_into(board, frames[i])
+            to_play[i] = board.to_play
+            if libs is not None:
+                for chain in board.chains.values():
+                    libs[i, list(chain.stones)] = len(chain.libs)
+                if board.ko_point:
+                    ko[i, board.ko_point] = True
+
+        stones = frames.reshape(B, H, W, W)[:, :, 1:-1, 1:-1]
+        own = to_play[:, None, None, None]
+        x[:, 0 : 2 * H : 2] = stones == own
+        x[:, 1 : 2 * H : 2] = stones == (3 - own)  # opponent color
+        x[:, self.color_plane] = (to_play == BLACK)[:, None, None]
+        if libs is not None:
+            lib = libs.reshape(B, W, W)[:, 1:-1, 1:-1]
+            base = self.liberty_planes
+            for k in range(3):
+                x[:, base + k] = lib == k + 1
+            x[:, base + 3] = lib >= 4
+            x[:, self.ko_plane] = ko.reshape(B, W, W)[:, 1:-1, 1:-1]
+            x[:, self.ones_plane] = 1.0
+        return x
+
+
+def encode(boards: Sequence[Board], history: int = 8, tactical: bool = True) -> "np.ndarray":
+    """Convenience wrapper: encode boards into a freshly allocated array."""
+    if not boards:
+        raise ValueError("encode needs at least one board.")
+    return FeatureEncoder(boards[0].N, history, tactical).encode(boards)
+
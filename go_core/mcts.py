@@ -1,107 +1,786 @@
 # go_core/mcts.py
-# Pure MCTS (no neural network) for Go, using the Board implementation.
+# MCTS for Go on the Board implementation: random rollouts, or PUCT with a leaf evaluator.
 
+import heapq
 import math
+import multiprocessing
 import random
-from typing import Optional
+import time
+from typing import Dict, List, Optional, Tuple
 
 from .board import Board, BLACK, WHITE, PASS_MOVE
+from .evaluator import Evaluator
+from .transposition import TranspositionTable
 
 
-def ucb1(child, c_puct: float = 1.4) -> float:
-    """UCB1 / PUCT-style score for child selection."""
+def ucb1(child, c_puct: float = 1.4, parent_n: Optional[int] = None) -> float:
+    """UCB1 / PUCT-style score for child selection.
+
+    `parent_n` is the visit count of the node selecting among its children;
+    it defaults to child.parent.N (shared transposition nodes pass it in).
+    """
     if child.N == 0:
         return float("inf")
+    if parent_n is None:
+        parent_n = child.parent.N
     return child.W / child.N + c_puct * math.sqrt(
-        math.log(child.parent.N + 1) / child.N
+        math.log(parent_n + 1) / child.N
     )
 
 
+def rave_score(child, c_puct: float, parent_n: int, rave_k: float) -> float:
+    """ucb1 with the value blended with AMAF statistics (RAVE).
+
+    beta = sqrt(k / (3N + k)) moves the weight from the AMAF value to the
+    child's own value as N grows; k is the visit count at which both count
+    equally.
+    """
+    if child.N == 0:
+        return float("inf")
+    q = child.W / child.N
+    if child.amaf_N:
+        beta = math.sqrt(rave_k / (3 * child.N + rave_k))
+        q = (1.0 - beta) * q + beta * child.amaf_W / child.amaf_N
+    return q + c_puct * math.sqrt(math.log(parent_n + 1) / child.N)
+
+
+def puct_score(child, c_puct: float, parent_n: int, prior: float) -> float:
+    """AlphaZero PUCT: Q + c * P * sqrt(parent N) / (1 + N), Q = 0 when unvisited."""
+    q = child.W / child.N if child.N else 0.0
+    return q + c_puct * prior * math.sqrt(parent_n) / (1 + child.N)
+
+
+def position_key(board: Board) -> Tuple[int, int]:
+    """
+    Transposition key of a position: Zobrist hash (stones and side to
+    move) plus the ko ban, which changes the legal moves.
+    """
+    return board.hash, board.ko_point
+
+
+def _push(board: Board, move) -> None:
+    """Play a tree move; a stored move that is now illegal is a search bug."""
+    if not board.push(move):
+        raise RuntimeError(f"Tree move {move!r} is illegal in the searched position.")
+
+
 class MCTSNode:
     """Node in the MCTS tree."""
 
-    __slots__ = ("parent", "move", "player_to_move", "N", "W", "children", "untried")
+    __slots__ = (
+        "parent",
+        "move",
+        "player_to_move",
+        "key",
+        "N",
+        "W",
+        "children",
+        "child_moves",
+        "untried",
+        "evicted",
+        "amaf_N",
+        "amaf_W",
+        "priors",
+    )
 
     def __init__(self, parent, move, player_to_move, board: Board):
         self.parent = parent
-        self.move = move  # move that led to this node
+        self.move = move  # move that first led to this node
         self.player_to_move = player_to_move
+        self.key = position_key(board)  # transposition key of the position at this node
         self.N = 0
         self.W = 0.0
+        # children[i] is reached by child_moves[i]; a node shared through the
+        # transposition table can be reached from other parents by other moves
         self.children = []
+        self.child_moves = []
         # We store legal moves at node creation time
         self.untried = board.legal_moves()
+        self.evicted = False  # dropped from the transposition table
+        # All-moves-as-first statistics, same sign convention as N / W
+        # (values from the point of view of the player who moved into the node)
+        self.amaf_N = 0
+        self.amaf_W = 0.0
+        # PUCT: move -> prior for the moves of this node once it has been
+        # evaluated (None before)
+        self.priors: Optional[Dict[object, float]] = None
+
+
+def _iter_nodes(root: MCTSNode):
+    """Every node reachable from root once (shared nodes make it a DAG)."""
+    seen = {id(root)}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        for ch in node.children:
+            if id(ch) not in seen:
+                seen.add(id(ch))
+                stack.append(ch)
+
+
+class SearchBudget:
+    """
+    Simulation and wall-clock budget of one search, with early stopping.
+
+    The search may stop before `sims` simulations when `max_time_s` has
+    elapsed, or (with `early_stop`) when the most visited root child cannot
+    be overtaken by the runner-up in the simulations that are left. With a
+    time limit the simulations left are estimated from the rate so far.
+    """
+
+    CHECK_EVERY = 16  # simulations between early-stop checks
+
+    def __init__(self, sims: int, max_time_s: Optional[float] = None, early_stop: bool = True):
+        self.sims = sims
+        self.max_time_s = max_time_s
+        self.early_stop = early_stop
+        self.start = time.perf_counter()
+        self._next_check = self.CHECK_EVERY
+
+    def remaining(self, done: int) -> float:
+        left = self.sims - done
+        if self.max_time_s is not None:
+            elapsed = time.perf_counter() - self.start
+            if elapsed >= self.max_time_s:
+                return 0
+            if done:
+                left = min(left, done / elapsed * (self.max_time_s - elapsed))
+        return left
+
+    def exhausted(self, done: int, root_visits) -> bool:
+        """
+        True when the search should stop; `root_visits()` gives the N values
+        of the root's candidate moves (0 for moves not expanded yet).
+        """
+        left = self.remaining(done)
+        if left <= 0:
+            return True
+        if self.early_stop and done >= self._next_check:
+            self._next_check = done + self.CHECK_EVERY
+            top = heapq.nlargest(2, root_visits())
+            if len(top) == 1 or (len(top) == 2 and top[0] - top[1] > left):
+                return True
+        return False
+
+
+def count_nodes(root: MCTSNode) -> int:
+    return sum(1 for _ in _iter_nodes(root))
+
+
+def prune_tree(root: MCTSNode, budget: int) -> int:
+    """
+    Keep at most `budget` nodes of the tree, preferring the most visited.
+
+    Dropped children give their move back to the parent's untried list so
+    they can be expanded again later. Returns the number of nodes kept.
+    """
+    nodes = list(_iter_nodes(root))
+    if len(nodes) <= budget:
+        return len(nodes)
+
+    keep = {id(n) for n in heapq.nlargest(budget, nodes, key=lambda n: n.N)}
+    keep.add(id(root))
+    for node in nodes:
+        if id(node) not in keep:
+            continue
+        children = []
+        moves = []
+        for mv, ch in zip(node.child_moves, node.children):
+            if id(ch) in keep:
+                children.append(ch)
+                moves.append(mv)
+            else:
+                node.untried.append(mv)
+        node.children = children
+        node.child_moves = moves
+    return count_nodes(root)
 
 
 class MCTS:
-    """Simple MCTS that works on the Board class without any neural network."""
+    """Simple MCTS that works on the Board class without any neural network.
+
+    With ``reuse_tree`` the search tree survives between choose() calls:
+    when the next position is a child or grandchild of the previous root
+    (our move, then the opponent's reply) that subtree becomes the new root.
+    ``max_nodes`` caps the tree size; expansion stops at the cap and a
+    reused subtree is pruned to half of it, keeping the most visited nodes.
+    It counts nodes, not bytes: a node keeps its list of untried legal
+    moves, about 24 KB early in a 19x19 game (about 6 KB on 9x9), so the
+    default of 20_000 nodes is roughly 480 MB at worst on 19x19. Size it
+    from the memory you can spare, especially when pondering without a
+    ponder_sims cap.
+
+    With ``transpositions`` nodes are shared between move orders that reach
+    the same position (same Zobrist hash and ko ban, see position_key()), so
+    their N/W statistics, children and untried moves are pooled. The table
+    holds at most ``tt_size`` nodes (default: ``max_nodes``) and evicts by
+    ``tt_policy`` ("lru" or "visits"); see self.tt.stats(). Nodes cut off
+    by tree reuse or pruning leave the table as well, so they can be freed.
+
+    With ``workers > 1`` the search is root-parallel: the simulations are
+    split across a persistent process pool, each worker grows its own tree
+    from the same root with its own random seed, and the root children's
+    visit counts and values are summed. Call close() to stop the pool.
+
+    With ``parallel="leaf"`` there is one shared tree instead: each step
+    selects ``leaf_batch`` leaves, using a virtual loss so they spread over
+    different branches, runs their rollouts together (on the pool when
+    ``workers > 1``) and backs all results up at once.
 
-    def __init__(self, sims: int = 800, c_puct: float = 1.4, rollout_limit: int = 300):
+    Finished games (rollouts, two passes in the tree) are scored with
+    Tromp–Taylor and ``komi``.
+
+    ``playout`` picks the rollout policy: "uniform" plays uniformly random
+    legal moves and stops after ``rollout_limit`` steps; "light" never
+    fills its own single-point eyes, passes only when nothing else is
+    left, and so plays games out to two passes (``rollout_limit`` is then
+    raised to at least 3 * N * N as a safety net against long cycles).
+
+    With ``rave`` every simulation also updates the AMAF statistics of the
+    children whose move the same player played later in the simulation, and
+    selection blends them in with rave_score() using ``rave_k``.
+
+    ``max_time_s`` bounds the wall-clock time of a search and
+    ``early_stop`` ends it once the best root move is decided (see
+    SearchBudget); ``sims`` stays the upper limit. The number of
+    simulations actually run is kept in ``last_sims``.
+
+    With an ``evaluator`` (see go_core.evaluator) the search runs in PUCT
+    mode: a new leaf is evaluated instead of rolled out, its priors are
+    stored on the node and children are created lazily in prior order,
+    and selection uses puct_score(). With ``parallel="leaf"`` the
+    ``leaf_batch`` leaves of a step are evaluated in one batch; pass an
+    InferenceQueue to batch across concurrent searches as well.
+    """
+
+    def __init__(
+        self,
+        sims: int = 800,
+        c_puct: float = 1.4,
+        rollout_limit: int = 300,
+        reuse_tree: bool = True,
+        max_nodes: int = 20_000,
+        transpositions: bool = False,
+        tt_size: Optional[int] = None,
+        tt_policy: str = "lru",
+        workers: int = 1,
+        parallel: str = "root",
+        leaf_batch: int = 8,
+        virtual_loss: float = 1.0,
+        playout: str = "uniform",
+        rave: bool = False,
+        rave_k: float = 1000.0,
+        max_time_s: Optional[float] = None,
+        early_stop: bool = True,
+        evaluator: Optional[Evaluator] = None,
+        komi: float = 7.5,
+    ):
+        if parallel not in ("root", "leaf"):
+            raise ValueError(f"parallel must be 'root' or 'leaf', got {parallel!r}.")
+        if playout not in ("uniform", "light"):
+            raise ValueError(f"playout must be 'uniform' or 'light', got {playout!r}.")
+        if evaluator is not None and (rave or (workers > 1 and parallel == "root")):
+            raise ValueError("An evaluator works with one shared tree and without RAVE.")
         self.sims = sims
         self.c_puct = c_puct
         self.rollout_limit = rollout_limit
+        self.komi = komi
+        self.playout = playout
+        self.rave = rave
+        self.rave_k = rave_k
+        self.max_time_s = max_time_s
+        self.early_stop = early_stop
+        self.evaluator = evaluator
+        self.last_sims = 0
+        self.last_ponder_sims = 0
+        self.reuse_tree = reuse_tree
+        self.max_nodes = max_nodes
+        self.tt: Optional[TranspositionTable] = (
+            TranspositionTable(tt_size or max_nodes, tt_policy) if transpositions else None
+        )
+        self.root: Optional[MCTSNode] = None
+        self.node_count = 0
+        # Root statistics of the last search: move -> (visits, total value)
+        self.last_stats: Dict[object, Tuple[int, float]] = {}
+
+        self.workers = workers
+        self.parallel = parallel
+        self.leaf_batch = max(1, leaf_batch)
+        self.virtual_loss = virtual_loss
+        self._pool = None
+        # Settings a root-parallel worker needs to rebuild an equivalent MCTS
+        self._worker_params = dict(
+            c_puct=c_puct,
+            rollout_limit=rollout_limit,
+            max_nodes=max_nodes,
+            transpositions=transpositions,
+            tt_size=tt_size,
+            tt_policy=tt_policy,
+            playout=playout,
+            rave=rave,
+            rave_k=rave_k,
+            max_time_s=max_time_s,
+            early_stop=early_stop,
+            komi=komi,
+        )
+
+    def close(self) -> None:
+        """Shut down the root-parallel worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def reset(self) -> None:
+        """Forget the search tree (e.g. at the start of a new game)."""
+        self.root = None
+        self.node_count = 0
+        if self.tt is not None:
+            self.tt.clear()
+
+    def _reuse_root(self, board: Board) -> Optional[MCTSNode]:
+        """Find the node for `board` among the old root and its descendants."""
+        old = self.root
+        if old is None:
+            return None
+        key = position_key(board)
+        if old.key == key:
+            return old
+        if self.tt is not None and key in self.tt:
+            return self.tt.get(key)
+        for child in old.children:
+            if child.key == key:
+                return child
+            for grandchild in child.children:
+                if grandchild.key == key:
+                    return grandchild
+        return None
+
+    def _prepare_root(self, board: Board) -> MCTSNode:
+        root = self._reuse_root(board) if self.reuse_tree else None
+        if root is None:
+            root = MCTSNode(None, None, board.to_play, board)
+            self.node_count = 1
+            if self.tt is not None:
+                self.tt.clear()
+                self.tt.put(root.key, root)
+        else:
+            # Cut the old branches loose so they can be freed
+            root.parent = None
+            self.node_count = prune_tree(root, self.max_nodes // 2)
+            if self.tt is not None:
+                self.tt.retain({id(n) for n in _iter_nodes(root)})
+        self.root = root
+        return root
 
     def choose(self, board: Board):
         """Run simulations and return the best move for the current player."""
-        root = MCTSNode(None, None, board.to_play, board)
+        if self.workers > 1 and self.parallel == "root":
+            return self._choose_root_parallel(board)
 
-        for _ in range(self.sims):
-            self._simulate(board.copy(), root)
+        root = self._prepare_root(board)
 
+        # One private board for the whole search; every simulation undoes
+        # its own moves with pop(), so nothing is copied per simulation.
+        board = board.copy()
+        if self.evaluator is not None and root.priors is None:
+            self._expand_evaluated([root], [board])
+        budget = SearchBudget(self.sims, self.max_time_s, self.early_stop)
+
+        def root_visits():
+            visits = [ch.N for ch in root.children]
+            if root.untried and self.node_count < self.max_nodes:
+                # A move not expanded yet (lazily, in PUCT mode) can still win
+                visits.append(0)
+            return visits
+
+        done = 0
+        if self.parallel == "leaf":
+            while not budget.exhausted(done, root_visits):
+                batch = min(self.leaf_batch, self.sims - done)
+                self._simulate_batch(board, root, batch)
+                done += batch
+        else:
+            while not budget.exhausted(done, root_visits):
+                self._simulate(board, root)
+                done += 1
+        self.last_sims = done
+
+        self.last_stats = {mv: (ch.N, ch.W) for mv, ch in zip(root.child_moves, root.children)}
         if not root.children:
             return PASS_MOVE
         # Choose the child with the highest visit count
-        best_child = max(root.children, key=lambda ch: ch.N)
-        return best_child.move
+        best = max(range(len(root.children)), key=lambda i: root.children[i].N)
+        return root.child_moves[best]
+
+    def ponder(self, board: Board, stop, max_sims: Optional[int] = None) -> int:
+        """
+        Keep growing the tree for `board` until `stop` (a threading.Event) is
+        set or `max_sims` simulations have run; return the simulations run.
+
+        Meant to run in a background thread while the opponent thinks; a
+        later choose() on the position after the opponent's reply reuses the
+        subtree. Only the single-process tree search can ponder.
+        """
+        if self.workers > 1 and self.parallel == "root":
+            raise ValueError("Pondering needs a shared tree (workers=1 or parallel='leaf').")
+        root = self._prepare_root(board)
+        board = board.copy()
+        if self.evaluator is not None and root.priors is None:
+            self._expand_evaluated([root], [board])
+        done = 0
+        while not stop.is_set() and (max_sims is None or done < max_sims):
+            if self.parallel == "leaf":
+                self._simulate_batch(board, root, self.leaf_batch)
+                done += self.leaf_batch
+            else:
+                self._simulate(board, root)
+                done += 1
+        self.last_ponder_sims = done
+        return done
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers)
+        return self._pool
+
+    def _choose_root_parallel(self, board: Board):
+        base, extra = divmod(self.sims, self.workers)
+        tasks = []
+        for i in range(self.workers):
+            sims = base + (1 if i < extra else 0)
+            if sims:
+                tasks.append((board, sims, random.getrandbits(63), self._worker_params))
+
+        merged: Dict[object, List[float]] = {}
+        self.last_sims = 0
+        for stats, sims in self._get_pool().map(_root_parallel_worker, tasks):
+            self.last_sims += sims
+            for move, n, w in stats:
+                entry = merged.setdefault(move, [0, 0.0])
+                entry[0] += n
+                entry[1] += w
+        self.last_stats = {move: (int(n), w) for move, (n, w) in merged.items()}
+        if not merged:
+            return PASS_MOVE
+        return max(merged, key=lambda mv: merged[mv][0])
 
     def _simulate(self, board: Board, node: MCTSNode) -> None:
+        depth = len(board.undo_stack)
+        path = self._select(board, node)
+        if self.evaluator is not None:
+            # A single leaf is evaluated in place, no copy of the board needed
+            value = self._evaluate_leaves([path], [board])[0]
+            while len(board.undo_stack) > depth:
+                board.pop()
+            self._backup_value(path, value)
+            return
+
+        # Rollout until two consecutive passes or rollout_limit
+        winner = self._rollout(board)
+        moves = board.move_history(depth) if self.rave else None
+
+        # Restore the search board to the root position
+        while len(board.undo_stack) > depth:
+            board.pop()
+        self._backup(path, winner, moves)
+
+    def _simulate_batch(self, board: Board, node: MCTSNode, count: int) -> None:
+        """Select `count` leaves under virtual loss, roll them out together, back up."""
+        depth = len(board.undo_stack)
+        vl = self.virtual_loss
+        paths = []
+        leaves = []
+        tree_moves = []
+        for _ in range(count):
+            path = self._select(board, node)
+            for n in path:
+                n.N += 1
+                n.W -= vl
+            paths.append(path)
+            leaves.append(board.copy())
+            tree_moves.append(board.move_history(depth) if self.rave else None)
+            while len(board.undo_stack) > depth:
+                board.pop()
+
+        if self.evaluator is not None:
+            values = self._evaluate_leaves(paths, leaves)
+            for path, value in zip(paths, values):
+                for n in path:
+                    n.N -= 1
+                    n.W += vl
+                self._backup_value(path, value)
+            return
+
+        results = self._rollout_many(leaves)
+        for path, moves, (winner, rollout_moves) in zip(paths, tree_moves, results):
+            for n in path:
+                n.N -= 1
+                n.W += vl
+            self._backup(path, winner, moves + rollout_moves if self.rave else None)
+
+    def _rollout_many(self, boards: List[Board]) -> List[Tuple[int, Optional[list]]]:
+        """(winner, rollout moves if RAVE is on) for each board."""
+        if self.workers <= 1 or len(boards) == 1:
+            return _play_out(self, boards)
+        size = -(-len(boards) // self.workers)
+        tasks = [
+            (boards[i : i + size], random.getrandbits(63), self._worker_params)
+            for i in range(0, len(boards), size)
+        ]
+        results: List[Tuple[int, Optional[list]]] = []
+        for chunk in self._get_pool().map(_rollout_worker, tasks):
+            results.extend(chunk)
+        return results
+
+    def _evaluate_leaves(self, paths: List[List[MCTSNode]], leaves: List[Board]) -> List[float]:
+        """Values (BLACK's point of view) of the leaves; evaluated leaves get priors."""
+        values: List[Optional[float]] = []
+        pending = []
+        for path, leaf in zip(paths, leaves):
+            undo = leaf.undo_stack
+            if len(undo) >= 2 and undo[-1][0] == 0 and undo[-2][0] == 0:
+                # Two passes end the game: score it instead of evaluating
+                black, white = leaf.score_tromp_taylor(komi=self.komi)
+                values.append(1.0 if black > white else -1.0 if white > black else 0.0)
+            else:
+                values.append(None)
+                pending.append(len(values) - 1)
+        if pending:
+            nodes = [paths[i][-1] for i in pending]
+            evaluated = self._expand_evaluated(nodes, [leaves[i] for i in pending])
+            for i, value in zip(pending, evaluated):
+                values[i] = value
+        return values
+
+    def _expand_evaluated(self, nodes: List[MCTSNode], boards: List[Board]) -> List[float]:
+        """Evaluate `boards` in one batch, store the priors on `nodes`; return values for BLACK."""
+        priors, values = self.evaluator.evaluate(boards)
+        result = []
+        for node, board, p, v in zip(nodes, boards, priors, values):
+            if node.priors is None:
+                N = board.N
+                moves = node.untried + node.child_moves
+                weights = [float(p[N * N if mv is PASS_MOVE else mv[0] * N + mv[1]]) for mv in moves]
+                total = sum(weights)
+                if total > 0:
+                    weights = [w / total for w in weights]
+                else:
+                    weights = [1.0 / len(moves)] * len(moves)
+                node.priors = dict(zip(moves, weights))
+            v = float(v)
+            result.append(v if board.to_play == BLACK else -v)
+        return result
+
+    def _select(self, board: Board, node: MCTSNode) -> List[MCTSNode]:
+        """Selection + expansion from `node`; the board is left at the leaf."""
+        if self.evaluator is not None:
+            return self._select_puct(board, node)
+        tt = self.tt
+
         # Selection
         cur = node
-        while not cur.untried and cur.children:
-            cur = max(cur.children, key=lambda ch: ucb1(ch, self.c_puct))
-            board.play(cur.move)
+        path = [cur]
+        while cur.children and (not cur.untried or self.node_count >= self.max_nodes):
+            if tt is not None and self._drop_evicted(cur):
+                continue
+            parent_n = cur.N
+            children = cur.children
+            if self.rave:
+                best = max(
+                    range(len(children)),
+                    key=lambda i: rave_score(children[i], self.c_puct, parent_n, self.rave_k),
+                )
+            else:
+                best = max(range(len(children)), key=lambda i: ucb1(children[i], self.c_puct, parent_n))
+            if any(n is children[best] for n in path):
+                return path  # shared nodes closed a cycle (passes, ko): stop here
+            _push(board, cur.child_moves[best])
+            cur = children[best]
+            path.append(cur)
+            if tt is not None:
+                tt.touch(cur.key)
 
         # Expansion
-        if cur.untried:
+        if cur.untried and self.node_count < self.max_nodes:
             move = random.choice(cur.untried)
             cur.untried.remove(move)
-            board.play(move)
-            child = MCTSNode(cur, move, board.to_play, board)
+            _push(board, move)
+            child = tt.get(position_key(board)) if tt is not None else None
+            if child is None or any(n is child for n in path):
+                # New position (or a cycle back to an ancestor): fresh node
+                child = MCTSNode(cur, move, board.to_play, board)
+                self.node_count += 1
+                if tt is not None and child.key not in tt:
+                    tt.put(child.key, child)
             cur.children.append(child)
+            cur.child_moves.append(move)
             cur = child
+            path.append(cur)
+        return path
 
-        # Rollout until two consecutive passes or rollout_limit
-        winner = self._rollout(board)
+    def _select_puct(self, board: Board, node: MCTSNode) -> List[MCTSNode]:
+        """
+        PUCT selection from `node` down to a node that has not been
+        evaluated yet. An untried move competes with the children as a
+        child with N = 0 and its prior; when it wins it is expanded and the
+        new node is the leaf.
+        """
+        tt = self.tt
+        c = self.c_puct
+        cur = node
+        path = [cur]
+        while cur.priors is not None:
+            if tt is not None and self._drop_evicted(cur):
+                continue
+            sqrt_n = math.sqrt(cur.N)
+            priors = cur.priors
+            best = best_move = None
+            best_score = -float("inf")
+            for mv, ch in zip(cur.child_moves, cur.children):
+                score = puct_score(ch, c, cur.N, priors.get(mv, 0.0))
+                if score > best_score:
+                    best, best_move, best_score = ch, mv, score
+            expand = False  # PASS_MOVE is None, so track the choice separately
+            if cur.untried and self.node_count < self.max_nodes:
+                move = max(cur.untried, key=lambda mv: priors.get(mv, 0.0))
+                expand = best is None or c * priors.get(move, 0.0) * sqrt_n > best_score
+            if not expand:
+                if best is None or any(n is best for n in path):
+                    # No legal moves, not even a pass, or shared nodes closed a
+                    # cycle (passes, ko): treat as a leaf
+                    return path
+                _push(board, best_move)
+                cur = best
+                path.append(cur)
+                if tt is not None:
+                    tt.touch(cur.key)
+                continue
 
-        # Backpropagation, value from BLACK's perspective
+            # Expansion of the winning untried move
+            cur.untried.remove(move)
+            _push(board, move)
+            child = tt.get(position_key(board)) if tt is not None else None
+            if child is None or any(n is child for n in path):
+                child = MCTSNode(cur, move, board.to_play, board)
+                self.node_count += 1
+                if tt is not None and child.key not in tt:
+                    tt.put(child.key, child)
+            cur.children.append(child)
+            cur.child_moves.append(move)
+            path.append(child)
+            if child.priors is None:
+                break
+            cur = child
+        return path
+
+    def _backup(self, path: List[MCTSNode], winner: int, moves: Optional[list] = None) -> None:
+        # Backpropagation, value from BLACK's perspective. Each node's W is
+        # kept from the point of view of the player who moved into it, which
+        # is the player selecting it from the parent.
         if winner == 0:
             value = 0.0
         else:
             value = 1.0 if winner == BLACK else -1.0
+        self._backup_value(path, value)
+        if moves is not None:
+            self._update_amaf(path, value, moves)
 
-        while cur is not None:
-            cur.N += 1
-            if cur.player_to_move == BLACK:
-                cur.W += value
+    @staticmethod
+    def _backup_value(path: List[MCTSNode], value: float) -> None:
+        """Add `value` (from BLACK's point of view) along the path."""
+        for n in path:
+            n.N += 1
+            if n.player_to_move == BLACK:
+                n.W -= value
             else:
-                cur.W -= value
-            cur = cur.parent
+                n.W += value
 
-    def _rollout(self, board: Board) -> int:
-        passes = 0
-        steps = 0
-        while passes < 2 and steps < self.rollout_limit:
-            moves = board.legal_moves()
-            non_pass = [m for m in moves if m is not PASS_MOVE]
-            if non_pass:
-                move = random.choice(non_pass)
+    @staticmethod
+    def _update_amaf(path: List[MCTSNode], value: float, moves: list) -> None:
+        """
+        AMAF update: moves[i] is the move played from path[i]; a child of
+        path[i] is credited if its player played its move anywhere from
+        index i onwards in this simulation (tree part and rollout).
+        """
+        played = set()
+        j = len(moves)
+        for i in range(len(path) - 1, -1, -1):
+            while j > i:
+                j -= 1
+                if moves[j][1] is not PASS_MOVE:
+                    played.add(moves[j])
+            node = path[i]
+            player = node.player_to_move
+            for mv, ch in zip(node.child_moves, node.children):
+                if (player, mv) in played:
+                    ch.amaf_N += 1
+                    if player == BLACK:
+                        ch.amaf_W += value
+                    else:
+                        ch.amaf_W -= value
+
+    def _drop_evicted(self, node: MCTSNode) -> bool:
+        """Unlink children evicted from the transposition table."""
+        if not any(ch.evicted for ch in node.children):
+            return False
+        children = []
+        moves = []
+        for mv, ch in zip(node.child_moves, node.children):
+            if ch.evicted:
+                node.untried.append(mv)
             else:
-                move = PASS_MOVE
-            board.play(move)
-            passes = passes + 1 if move is PASS_MOVE else 0
-            steps += 1
-
-        black_score, white_score = board.score_tromp_taylor(komi=7.5)
-        if abs(black_score - white_score) < 1e-6:
-            return 0  # draw
-        return BLACK if black_score > white_score else WHITE
+                children.append(ch)
+                moves.append(mv)
+        node.children = children
+        node.child_moves = moves
+        # The evicted children's subtrees go too, unless shared elsewhere
+        self.node_count = count_nodes(self.root)
+        return True
+
+    def _rollout(self, board: Board) -> int:
+        return rollout(board, self.playout, self.rollout_limit, self.komi)
+
+
+def rollout(board: Board, playout: str = "uniform", rollout_limit: int = 300, komi: float = 7.5) -> int:
+    """Play random moves on `board` (pushed, not undone); return the winner or 0."""
+    light = playout == "light"
+    limit = max(rollout_limit, 3 * board.N * board.N) if light else rollout_limit
+    passes = 0
+    steps = 0
+    while passes < 2 and steps < limit:
+        move = board.random_legal_move(skip_eyes=light)
+        board.push(move)
+        passes = passes + 1 if move is PASS_MOVE else 0
+        steps += 1
+
+    black_score, white_score = board.score_tromp_taylor(komi=komi)
+    if abs(black_score - white_score) < 1e-6:
+        return 0  # draw
+    return BLACK if black_score > white_score else WHITE
+
+
+def _root_parallel_worker(args) -> Tuple[List[Tuple[object, int, float]], int]:
+    """Run one independent search in a pool process; return root child stats."""
+    board, sims, seed, params = args
+    random.seed(seed)
+    mcts = MCTS(sims=sims, reuse_tree=False, **params)
+    mcts.choose(board)
+    return [(move, n, w) for move, (n, w) in mcts.last_stats.items()], mcts.last_sims
+
+
+def _play_out(mcts: MCTS, boards: List[Board]) -> List[Tuple[int, Optional[list]]]:
+    results = []
+    for board in boards:
+        start = len(board.undo_stack)
+        winner = mcts._rollout(board)
+        results.append((winner, board.move_history(start) if mcts.rave else None))
+    return results
+
+
+def _rollout_worker(args) -> List[Tuple[int, Optional[list]]]:
+    """Play out a chunk of leaf positions in a pool process."""
+    boards, seed, params = args
+    random.seed(seed)
+    return _play_out(MCTS(sims=0, reuse_tree=False, **params), boards)
@@ -0,0 +1,105 @@
+# go_core/transposition.py
+# Bounded transposition table mapping position keys to shared MCTS nodes.
+
+import heapq
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class TranspositionTable:
+    """
+    Position-key -> node table with a fixed node budget.
+
+    Eviction policies:
+      - "lru":    drop the least recently used entry.
+      - "visits": when full, drop the least visited tenth of the entries.
+
+    Evicted nodes are flagged (node.evicted = True) so the search can unlink
+    them from their parents and let them be freed.
+    """
+
+    POLICIES = ("lru", "visits")
+
+    def __init__(self, capacity: int = 100_000, policy: str = "lru"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r}, expected one of {self.POLICIES}.")
+        if capacity < 1:
+            raise ValueError("capacity must be positive.")
+        self.capacity = capacity
+        self.policy = policy
+        self._table: "OrderedDict[Hashable, object]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._table
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """Look up a node, counting the hit or miss."""
+        node = self._table.get(key)
+        if node is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == "lru":
+            self._table.move_to_end(key)
+        return node
+
+    def touch(self, key: Hashable) -> None:
+        """Mark an entry as recently used (no-op for the visits policy)."""
+        if self.policy == "lru" and key in self._table:
+            self._table.move_to_end(key)
+
+    def put(self, key: Hashable, node) -> None:
+        self._table[key] = node
+        if self.policy == "lru":
+            self._table.move_to_end(key)
+        if len(self._table) > self.capacity:
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.policy == "lru":
+            while len(self._table) > self.capacity:
+                _, node = self._table.popitem(last=False)
+                node.evicted = True
+                self.evictions += 1
+            return
+        # Evict in batches so the O(n log k) scan is amortized
+        excess = len(self._table) - self.capacity
+        count = max(excess, self.capacity // 10)
+        victims = heapq.nsmallest(count, self._table.items(), key=lambda kv: kv[1].N)
+        for key, node in victims:
+            del self._table[key]
+            node.evicted = True
+        self.evictions += len(victims)
+
+    def retain(self, keep) -> int:
+        """Drop (and flag) every entry whose node is not in `keep`, a set of node ids; return how many."""
+        dropped = [key for key, node in self._table.items() if id(node) not in keep]
+        for key in dropped:
+            self._table.pop(key).evicted = True
+        return len(dropped)
+
+    def clear(self) -> None:
+        for node in self._table.values():
+            node.evicted = True
+        self._table.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._table),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+        }
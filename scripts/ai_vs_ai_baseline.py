@@ -3,9 +3,9 @@
 
 import sys
 
-from go_core.board import Board, BLACK, WHITE, PASS_MOVE
 from engines.baseline_mcts_engine import BaselineMCTSEngine
 from utils.sgf_writer import moves_to_sgf
+from utils.tournament import play_game
 
 
 def main():
@@ -20,36 +20,16 @@ def main():
     engine_black = BaselineMCTSEngine(simulations=sims_black)
     engine_white = BaselineMCTSEngine(simulations=sims_white)
 
-    board = Board()
-    moves = []
-    passes = 0
-    move_no = 1
-
-    while passes < 2:
-        engine = engine_black if board.to_play == BLACK else engine_white
-        mv = engine.genmove(board)
-        board.play(mv)
-
-        color_char = "B" if board.to_play == WHITE else "W"
-        if mv is PASS_MOVE:
-            print(f"{move_no:03d} {color_char}: PASS")
-        else:
-            print(f"{move_no:03d} {color_char}: {board.to_coord(*mv)}")
-
-        moves.append((BLACK if color_char == "B" else WHITE, mv))
-        move_no += 1
-        passes = passes + 1 if mv is PASS_MOVE else 0
-
-    bs, ws = board.score_tromp_taylor(komi=7.5)
-    print(f"Final Score — Black: {bs:.1f}, White: {ws:.1f} (komi 7.5)")
-    if abs(bs - ws) < 1e-6:
-        print("Result: Draw")
-    elif bs > ws:
-        print("Result: Black wins")
-    else:
-        print("Result: White wins")
-
-    sgf = moves_to_sgf(moves, board_size=board.N)
+    result = play_game(engine_black, engine_white, komi=7.5, verbose=True)
+
+    sgf = moves_to_sgf(
+        result.moves,
+        board_size=19,
+        black=engine_black.name(),
+        white=engine_white.name(),
+        result=result.result_string,
+        komi=7.5,
+    )
     with open("baseline_vs_baseline.sgf", "w", encoding="utf-8") as f:
         f.write(sgf)
     print("SGF saved to baseline_vs_baseline.sgf")
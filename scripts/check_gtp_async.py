@@ -0,0 +1,72 @@
+# scripts/check_gtp_async.py
+# Smoke test of the asyncio GTP client against scripts/fake_gtp_engine.py.
+
+import asyncio
+import os
+import sys
+
+from go_core.board import Board, BLACK, WHITE
+from engines.gtp import GTPCommandError, GTPTimeout
+from engines.gtp_async import AsyncGTPClient
+
+FAKE = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_gtp_engine.py")]
+
+
+async def play_one(client: AsyncGTPClient, moves: int = 20) -> None:
+    """Sync a game in one pipelined burst, then alternate genmoves."""
+    board = Board(9)
+    for _ in range(6):
+        board.play(board.random_legal_move())
+    await client.load_game(board)
+    color = board.to_play
+    for _ in range(moves):
+        vertex = await client.genmove(color)
+        assert board.play(board.from_coord(vertex)), vertex
+        color = WHITE if color == BLACK else BLACK
+
+
+async def main():
+    client = await AsyncGTPClient.start(FAKE, timeout=5.0)
+    try:
+        await play_one(client)
+
+        # Multi-line response framed on the blank line, then the next command still matches
+        rows = (await client.send("showboard")).splitlines()
+        assert len(rows) == 9, rows
+        assert await client.send("name") == "FakeGTP"
+
+        try:
+            await client.send("play B Z99")
+            raise AssertionError("a '?' response must raise GTPCommandError")
+        except GTPCommandError:
+            pass
+
+        names = await client.send_many(["name"] * 50)
+        assert names == ["FakeGTP"] * 50
+
+        try:
+            await client.send("hang", timeout=0.5)
+            raise AssertionError("a hung command must time out")
+        except GTPTimeout:
+            assert not client.healthy
+    finally:
+        await client.close(timeout=1.0)
+
+    # Engines that do not echo ids are matched in order
+    plain = await AsyncGTPClient.start(FAKE + ["--no-ids"], timeout=5.0)
+    try:
+        await play_one(plain, moves=6)
+    finally:
+        await plain.close()
+
+    # Many engines driven from one event loop, no thread per process
+    clients = await asyncio.gather(*(AsyncGTPClient.start(FAKE + ["--latency", "0.002"], 10.0) for _ in range(12)))
+    try:
+        await asyncio.gather(*(play_one(c) for c in clients))
+    finally:
+        await asyncio.gather(*(c.close() for c in clients))
+    print("Async GTP client: OK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+# scripts/check_gtp_pool.py
+# Smoke test of GTPEnginePool and KataGoEngine's restart path against scripts/fake_gtp_engine.py.
+
+import os
+import sys
+
+from go_core.board import Board
+from engines.gtp import GTPEnginePool, GTPTimeout
+from engines.katago_engine import KataGoEngine
+
+FAKE = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_gtp_engine.py")]
+
+
+def check_pool():
+    pool = GTPEnginePool(FAKE, size=2, setup=["boardsize 9"], timeout=1.0)
+    try:
+        a, b = pool.acquire(), pool.acquire()
+        try:
+            pool.acquire(timeout=0.2)
+            raise AssertionError("acquire must time out while every process is leased")
+        except GTPTimeout:
+            pass
+
+        # A hung process is unhealthy and replaced on release
+        try:
+            a.send("hang", timeout=0.3)
+            raise AssertionError("a hung command must time out")
+        except GTPTimeout:
+            pass
+        assert not a.healthy
+        pool.release(a)
+        assert pool.restarts == 1
+
+        # A replacement that fails to start keeps its slot in the pool
+        b.close()  # crashed
+        command, pool.command = pool.command, ["/nonexistent/gtp-engine"]
+        try:
+            pool.replace(b)
+            raise AssertionError("spawning a missing binary must fail")
+        except OSError:
+            pass
+        pool.command = command
+        leased = [pool.acquire(timeout=5), pool.acquire(timeout=5)]
+        assert all(p.ping() for p in leased), "both slots must be usable again"
+        for p in leased:
+            pool.release(p)
+    finally:
+        pool.close()
+
+
+def check_engine_restart():
+    # Every process hangs on its 3rd genmove; the engine must restart it and carry on
+    pool = GTPEnginePool(FAKE + ["--hang-genmove", "3"], size=1, timeout=0.5)
+    try:
+        engine = KataGoEngine(pool=pool, komi=7.5, acquire_timeout=1.0)
+        board = Board(9)
+        engine.on_game_start(board)
+        for _ in range(8):
+            assert board.play(engine.genmove(board))
+        assert engine.restarts >= 1 and pool.restarts == engine.restarts
+
+        # The only process is leased: a second engine gives up after acquire_timeout
+        other = KataGoEngine(pool=pool, acquire_timeout=0.2)
+        try:
+            other.on_game_start(Board(9))
+            raise AssertionError("a second lease must time out")
+        except GTPTimeout:
+            pass
+        engine.on_game_end(board, None)
+        other.on_game_start(Board(9))
+        other.on_game_end(Board(9), None)
+    finally:
+        pool.close()
+
+
+def main():
+    check_pool()
+    check_engine_restart()
+    print("GTP engine pool: OK")
+
+
+if __name__ == "__main__":
+    main()
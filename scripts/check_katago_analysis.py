@@ -0,0 +1,52 @@
+# scripts/check_katago_analysis.py
+# Smoke test of the KataGo analysis client against scripts/fake_katago_analysis.py.
+
+import asyncio
+import os
+import sys
+
+from go_core.board import Board
+from engines.katago_analysis import KataGoAnalysis, KataGoAnalysisEngine
+
+FAKE = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_katago_analysis.py")]
+
+
+def main():
+    analysis = KataGoAnalysis(command=FAKE)
+    try:
+        # Many queries in flight at once; each answer must reach its own future
+        futures = [analysis.query([["B", "D4"]] * (i % 2), board_size=9, max_visits=i + 1) for i in range(100)]
+        for i, future in enumerate(futures):
+            assert future.result(timeout=10)["rootInfo"]["visits"] == i + 1
+
+        turns = analysis.query([["B", "D4"], ["W", "E5"]], board_size=9, analyze_turns=[0, 1, 2]).result(10)
+        assert [r["turnNumber"] for r in turns] == [0, 1, 2]
+
+        # Partial results and warnings must not resolve the future early
+        final = analysis.query([], board_size=9, max_visits=7, reportDuringSearchEvery=0.1).result(10)
+        assert final["rootInfo"]["visits"] == 7 and not final["isDuringSearch"]
+        assert analysis.query([], board_size=9, max_visits=3, bogusField=1).result(10)["rootInfo"]["visits"] == 3
+
+        try:
+            analysis.query([], board_size=9, max_visits=0).result(10)
+            raise AssertionError("an error response must fail the future")
+        except RuntimeError:
+            pass
+
+        async def concurrent():
+            return await asyncio.gather(*(analysis.aquery([], board_size=9, include_ownership=True) for _ in range(20)))
+
+        assert all(len(r["ownership"]) == 81 for r in asyncio.run(concurrent()))
+
+        engine = KataGoAnalysisEngine(analysis, max_visits=50)
+        board = Board(9)
+        for _ in range(10):
+            move = engine.genmove(board)
+            assert board.play(move)
+    finally:
+        analysis.close()
+    print("KataGo analysis client: OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# scripts/fake_gtp_engine.py
+# Minimal GTP engine playing random legal moves, for testing GTP clients without KataGo.
+#
+# Usage: fake_gtp_engine.py [--no-ids] [--latency SECONDS] [--hang-genmove N]
+#   --no-ids        answer "= ..." without echoing command ids, like some engines
+#   --latency       delay before every response
+#   --hang-genmove  never answer the N-th genmove (a stuck search)
+# Besides the usual commands it knows "showboard" (a multi-line response)
+# and "hang" (never answers), to exercise response framing and timeouts.
+
+import argparse
+import sys
+import time
+
+from go_core.board import Board, BLACK, WHITE
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-ids", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--hang-genmove", type=int, default=0)
+    args = parser.parse_args()
+
+    board = Board(19)
+    genmoves = 0
+    for line in sys.stdin:
+        parts = line.split()
+        if not parts:
+            continue
+        cid = ""
+        if parts[0].isdigit():
+            cid, parts = parts[0], parts[1:]
+        if args.no_ids:
+            cid = ""
+        cmd, params = parts[0], parts[1:]
+        sys.stderr.write(f"fake gtp: {cmd}\n")  # engines log to stderr; clients must drain it
+        if args.latency:
+            time.sleep(args.latency)
+
+        ok, out = True, ""
+        if cmd == "name":
+            out = "FakeGTP"
+        elif cmd == "boardsize":
+            board = Board(int(params[0]))
+        elif cmd == "clear_board":
+            board = Board(board.N)
+        elif cmd == "komi":
+            pass
+        elif cmd == "play":
+            color = BLACK if params[0].upper().startswith("B") else WHITE
+            if color != board.to_play:
+                board.play(None)
+            move = board.from_coord(params[1])
+            if (move is None and params[1].lower() != "pass") or not board.play(move):
+                ok, out = False, "illegal move"
+        elif cmd == "genmove":
+            genmoves += 1
+            if genmoves == args.hang_genmove:
+                time.sleep(3600)
+            move = board.random_legal_move()
+            board.play(move)
+            out = "pass" if move is None else board.to_coord(*move)
+        elif cmd == "showboard":
+            out = "\n" + "\n".join(
+                "".join(".XO"[board.stones[board.point(r, c)]] for c in range(board.N)) for r in range(board.N)
+            )
+        elif cmd == "hang":
+            time.sleep(3600)
+        elif cmd == "quit":
+            sys.stdout.write(f"={cid}\n\n")
+            sys.stdout.flush()
+            break
+        else:
+            ok, out = False, "unknown command"
+        sys.stdout.write(f"{'=' if ok else '?'}{cid} {out}\n\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# scripts/fake_katago_analysis.py
+# Stand-in for `katago analysis` that speaks its JSON protocol, for testing without a model.
+
+import json
+import random
+import sys
+import threading
+import time
+
+from go_core.board import Board
+
+_out_lock = threading.Lock()
+
+KNOWN_FIELDS = {
+    "id", "moves", "rules", "komi", "boardXSize", "boardYSize", "maxVisits",
+    "includeOwnership", "analyzeTurns", "includePolicy", "overrideSettings", "reportDuringSearchEvery",
+}
+
+
+def _write(response: dict) -> None:
+    with _out_lock:
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+def answer(query: dict) -> None:
+    """Answer after a random delay, so responses come back out of order like KataGo's."""
+    time.sleep(random.random() * 0.05)
+    visits = query.get("maxVisits", 10)
+    if visits < 1:
+        _write({"id": query["id"], "error": "maxVisits must be positive"})
+        return
+    for field in query:
+        if field not in KNOWN_FIELDS:
+            _write({"id": query["id"], "field": field, "warning": "Unexpected or unused field"})
+    size = query["boardXSize"]
+    board = Board(size)
+    for _, move in query["moves"]:
+        board.play(board.from_coord(move))
+    for turn in query.get("analyzeTurns", [len(query["moves"])]):
+        move = board.random_legal_move()
+        response = {
+            "id": query["id"],
+            "turnNumber": turn,
+            "moveInfos": [
+                {"move": "pass" if move is None else board.to_coord(*move), "order": 0, "visits": visits}
+            ],
+            "rootInfo": {"winrate": 0.5, "scoreLead": 0.0, "visits": visits},
+        }
+        if query.get("includeOwnership"):
+            response["ownership"] = [0.0] * (size * size)
+        if "reportDuringSearchEvery" in query:
+            # A partial result with fewer visits comes first
+            partial = dict(response, isDuringSearch=True, rootInfo=dict(response["rootInfo"], visits=1))
+            _write(partial)
+            response["isDuringSearch"] = False
+        _write(response)
+
+
+def main():
+    threads = []
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        # KataGo logs to stderr as it goes; clients must drain it
+        sys.stderr.write("fake analysis: query received\n")
+        thread = threading.Thread(target=answer, args=(json.loads(line),))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -29,7 +29,8 @@ def main():
         sims = int(sys.argv[2])
 
     human_color = BLACK if color.lower().startswith("b") else WHITE
-    ai = BaselineMCTSEngine(simulations=sims)
+    # Ponder: keep searching while the human thinks
+    ai = BaselineMCTSEngine(simulations=sims, ponder=True)
     board = Board()
 
     print(
@@ -44,6 +45,7 @@ def main():
             mv = human_move(board)
             if mv == "QUIT":
                 print("Game aborted.")
+                ai.close()
                 return
         else:
             print(f"{ai.name()} thinking...")
@@ -66,7 +68,9 @@ def main():
                 print("Result: Black wins")
             else:
                 print("Result: White wins")
+            ai.on_game_end(board, (bs, ws))
             break
+    ai.close()
 
 
 if __name__ == "__main__":
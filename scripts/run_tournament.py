@@ -0,0 +1,89 @@
+# scripts/run_tournament.py
+# Play a multi-game match between two engines in parallel and write SGFs plus a summary.
+
+import argparse
+
+from utils.sprt import SPRT
+from utils.tournament import parse_spec, run_match
+
+
+def read_openings(path):
+    """One opening per line, moves separated by spaces (e.g. "D4 Q16 PASS"); '#' starts a comment."""
+    openings = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                openings.append(line.split())
+    return openings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a match between two engines.")
+    parser.add_argument(
+        "engines",
+        nargs=2,
+        metavar="SPEC",
+        help='engine spec "label=kind:key=value,...", e.g. "strong=katago:model_path=a.bin.gz,'
+        'config_path=gtp.cfg,max_concurrent=2" or "fast=baseline:simulations=200"',
+    )
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--out", default="results/match", help="output directory")
+    parser.add_argument("--workers", type=int, default=None, help="parallel games (default: CPU count)")
+    parser.add_argument("--size", type=int, default=19)
+    parser.add_argument("--komi", type=float, default=7.5)
+    parser.add_argument("--openings", help="file of openings, each played with both colors")
+    parser.add_argument("--max-moves", type=int, default=None)
+    parser.add_argument("--no-alternate", action="store_true", help="first engine always plays black")
+    parser.add_argument("--title", default=None)
+    parser.add_argument(
+        "--sprt",
+        metavar="ELO0,ELO1",
+        help="stop early once an SPRT of the first engine's Elo (H0: ELO0, H1: ELO1) decides, "
+        'e.g. "0,20"; --games is then the maximum',
+    )
+    parser.add_argument("--alpha", type=float, default=0.05, help="SPRT false-positive rate")
+    parser.add_argument("--beta", type=float, default=0.05, help="SPRT false-negative rate")
+    args = parser.parse_args()
+
+    engine_a, engine_b = (parse_spec(s) for s in args.engines)
+    openings = read_openings(args.openings) if args.openings else ()
+    sprt = None
+    if args.sprt:
+        elo0, elo1 = (float(x) for x in args.sprt.split(","))
+        sprt = SPRT(elo0, elo1, args.alpha, args.beta)
+
+    def report(record, summary):
+        outcome = record.error or record.result
+        print(
+            f"Game {record.game:3d}: {record.black} (B) vs {record.white} (W): {outcome} "
+            f"[{record.moves} moves, {record.seconds:.1f}s] — "
+            f"{summary.a} {summary.wins_a} : {summary.wins_b} {summary.b}, {summary.elo()}"
+        )
+        if summary.sprt is not None:
+            test = summary.sprt
+            print(f"    LLR {test.llr:.2f} [{test.lower:.2f}, {test.upper:.2f}] {test.decision or ''}".rstrip())
+        return False
+
+    run_match(
+        engine_a,
+        engine_b,
+        args.games,
+        args.out,
+        openings=openings,
+        alternate_colors=not args.no_alternate,
+        workers=args.workers,
+        board_size=args.size,
+        komi=args.komi,
+        max_moves=args.max_moves,
+        on_game=report,
+        title=args.title,
+        sprt=sprt,
+    )
+    with open(f"{args.out}/summary.txt", encoding="utf-8") as f:
+        print()
+        print(f.read())
+
+
+if __name__ == "__main__":
+    main()
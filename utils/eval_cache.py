@@ -0,0 +1,154 @@
+# utils/eval_cache.py
+# Persistent position-evaluation cache: in-memory LRU in front of sqlite.
+
+import json
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from go_core.board import Board
+
+Move = Optional[Tuple[int, int]]
+
+
+class CacheEntry(NamedTuple):
+    """What an engine decided in one position."""
+
+    move: Move  # chosen move, PASS_MOVE (None) for a pass
+    visits: Dict[Move, int]  # search visit distribution, may be empty
+    value: Optional[float]  # value of the position for the side to move
+    ownership: Optional[List[float]]  # N*N ownership, +1 black .. -1 white
+
+
+def cache_key(board: Board, komi: float, engine_id: str, budget) -> str:
+    """
+    Key of a search result: position hash, side to move, ko ban, komi,
+    engine id and search budget (e.g. simulations or max visits).
+    """
+    return f"{board.hash:016x}:{board.to_play}:{board.ko_point}:{komi:g}:{engine_id}:{budget}"
+
+
+def _encode_move(move: Move):
+    return None if move is None else list(move)
+
+
+def _decode_move(data) -> Move:
+    return None if data is None else (data[0], data[1])
+
+
+class EvalCache:
+    """
+    Disk-backed cache of CacheEntry values keyed by cache_key().
+
+    Lookups go through an in-memory LRU of `memory_size` entries first and
+    fall back to a sqlite table at `path` (":memory:" for a throwaway
+    cache). Writes are committed every `commit_every` puts and on flush()
+    / close(). Safe to share between threads.
+    """
+
+    def __init__(
+        self, path: str = "eval_cache.sqlite", memory_size: int = 10_000, commit_every: int = 64
+    ):
+        self.path = path
+        self.memory_size = memory_size
+        self.commit_every = max(1, commit_every)
+        self._lru: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._uncommitted = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS evals ("
+            " key TEXT PRIMARY KEY,"
+            " move TEXT,"
+            " visits TEXT,"
+            " value REAL,"
+            " ownership BLOB)"
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return entry
+            row = self._db.execute(
+                "SELECT move, visits, value, ownership FROM evals WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            entry = self._decode(row)
+            self._remember(key, entry)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._remember(key, entry)
+            self._db.execute(
+                "INSERT OR REPLACE INTO evals VALUES (?, ?, ?, ?, ?)", (key,) + self._encode(entry)
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._db.commit()
+                self._uncommitted = 0
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_size:
+            self._lru.popitem(last=False)
+
+    @staticmethod
+    def _encode(entry: CacheEntry) -> tuple:
+        visits = [[_encode_move(mv), n] for mv, n in entry.visits.items()]
+        ownership = None
+        if entry.ownership is not None:
+            ownership = array("f", entry.ownership).tobytes()
+        return json.dumps(_encode_move(entry.move)), json.dumps(visits), entry.value, ownership
+
+    @staticmethod
+    def _decode(row) -> CacheEntry:
+        move, visits, value, ownership = row
+        owner = None
+        if ownership is not None:
+            owner = array("f")
+            owner.frombytes(ownership)
+            owner = owner.tolist()
+        return CacheEntry(
+            _decode_move(json.loads(move)),
+            {_decode_move(mv): n for mv, n in json.loads(visits)},
+            value,
+            owner,
+        )
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "memory": len(self._lru),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def flush(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
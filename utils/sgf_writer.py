@@ -16,14 +16,33 @@ def coord_to_sgf(r: int, c: int, board_size: int) -> str:
 
 
 def moves_to_sgf(
-    moves: List[Tuple[int, Optional[Tuple[int, int]]]], board_size: int = 19
+    moves: List[Tuple[int, Optional[Tuple[int, int]]]],
+    board_size: int = 19,
+    black: Optional[str] = None,
+    white: Optional[str] = None,
+    result: Optional[str] = None,
+    komi: Optional[float] = None,
 ) -> str:
     """
     Convert a list of (player, move) to a simple SGF string.
     player: BLACK or WHITE
     move: (r, c) or PASS_MOVE
+    black / white: player names (PB / PW), result: e.g. "B+3.5" (RE),
+    komi: KM; each is only written when given.
     """
-    header = f"(;GM[1]FF[4]SZ[{board_size}]CA[UTF-8]\n"
+    header = f"(;GM[1]FF[4]SZ[{board_size}]CA[UTF-8]"
+    if komi is not None:
+        header += f"KM[{komi:g}]"
+    header += "\n"
+    info = ""
+    if black is not None:
+        info += f"PB[{_escape(black)}]"
+    if white is not None:
+        info += f"PW[{_escape(white)}]"
+    if result is not None:
+        info += f"RE[{_escape(result)}]"
+    if info:
+        header += info + "\n"
     body_parts = []
     for player, move in moves:
         color = "B" if player == BLACK else "W"
@@ -35,3 +54,8 @@ def moves_to_sgf(
             body_parts.append(f";{color}[{sgf_coord}]")
     body = "".join(body_parts)
     return header + body + ")\n"
+
+
+def _escape(text: str) -> str:
+    """Escape SGF property-value special characters."""
+    return text.replace("\\", "\\\\").replace("]", "\\]")
@@ -0,0 +1,115 @@
+# utils/sprt.py
+# Elo estimates with confidence intervals and a sequential probability ratio test for matches.
+
+import math
+from statistics import NormalDist
+from typing import NamedTuple, Optional, Tuple
+
+# Scores are clamped away from 0 and 1, where the Elo difference is infinite
+_SCORE_EPS = 1e-3
+
+
+def elo_to_score(elo: float) -> float:
+    """Expected score of a player `elo` points stronger (logistic model)."""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    """Elo difference that gives the expected `score`."""
+    score = min(max(score, _SCORE_EPS), 1.0 - _SCORE_EPS)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def _score_stats(wins: float, draws: float, losses: float) -> Tuple[float, float, float]:
+    """(games, mean score, per-game score variance) of a trinomial result."""
+    n = wins + draws + losses
+    score = (wins + 0.5 * draws) / n
+    var = (wins * (1.0 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score**2) / n
+    return n, score, var
+
+
+class EloEstimate(NamedTuple):
+    elo: float
+    lower: float  # confidence interval bounds
+    upper: float
+    score: float  # mean score per game
+    games: int
+
+    def __str__(self) -> str:
+        if not self.games:
+            return "no games yet"
+        elo, lower, upper = (round(x) for x in (self.elo, self.lower, self.upper))
+        return f"{elo:+d} Elo [{lower:+d}, {upper:+d}] over {self.games} games"
+
+
+def elo_estimate(wins: int, draws: int, losses: int, confidence: float = 0.95) -> EloEstimate:
+    """
+    Elo difference of the player with `wins` over their opponent, with a
+    Wilson score interval on the mean score (using the observed per-game
+    variance, so draws narrow it). Unlike the plain normal interval it
+    keeps a width after one-sided results: 3-0 gives [-43, +1200] Elo.
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return EloEstimate(0.0, -math.inf, math.inf, 0.5, 0)
+    n, score, var = _score_stats(wins, draws, losses)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+    z2 = z * z / n
+    center = (score + z2 / 2.0) / (1.0 + z2)
+    margin = z * math.sqrt(var / n + z2 / (4.0 * n)) / (1.0 + z2)
+    return EloEstimate(
+        score_to_elo(score), score_to_elo(center - margin), score_to_elo(center + margin), score, games
+    )
+
+
+class SPRTResult(NamedTuple):
+    llr: float  # log-likelihood ratio of H1 over H0
+    lower: float  # accept H0 at or below this
+    upper: float  # accept H1 at or above this
+    decision: Optional[str]  # "H0", "H1" or None (keep playing)
+
+
+class SPRT:
+    """
+    Sequential probability ratio test of H0: elo == elo0 against
+    H1: elo == elo1 (elo1 > elo0), e.g. SPRT(0, 20) to check that a change
+    is worth at least ~20 Elo.
+
+    Uses the generalized SPRT with a normal approximation of the trinomial
+    (win / draw / loss) score: LLR = n (s1 - s0) (2 s - s0 - s1) / (2 var),
+    with the observed mean score s and per-game variance var. The test
+    stops once the LLR leaves [log(beta / (1 - alpha)), log((1 - beta) / alpha)],
+    so alpha / beta are the false-positive / false-negative rates.
+
+    Half a win and half a loss are added to the observed results, so that
+    the variance is not zero after a handful of one-sided games.
+    """
+
+    def __init__(self, elo0: float, elo1: float, alpha: float = 0.05, beta: float = 0.05):
+        if elo1 <= elo0:
+            raise ValueError("elo1 must be greater than elo0.")
+        if not (0.0 < alpha < 1.0 and 0.0 < beta < 1.0):
+            raise ValueError("alpha and beta must be in (0, 1).")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.lower = math.log(beta / (1.0 - alpha))
+        self.upper = math.log((1.0 - beta) / alpha)
+
+    def llr(self, wins: int, draws: int, losses: int) -> float:
+        n, score, var = _score_stats(wins + 0.5, draws, losses + 0.5)
+        s0, s1 = elo_to_score(self.elo0), elo_to_score(self.elo1)
+        return n * (s1 - s0) * (2.0 * score - s0 - s1) / (2.0 * var)
+
+    def test(self, wins: int, draws: int, losses: int) -> SPRTResult:
+        llr = self.llr(wins, draws, losses)
+        decision = None
+        if llr >= self.upper:
+            decision = "H1"
+        elif llr <= self.lower:
+            decision = "H0"
+        return SPRTResult(llr, self.lower, self.upper, decision)
+
+    def __str__(self) -> str:
+        return f"SPRT elo0={self.elo0:g} elo1={self.elo1:g} alpha={self.alpha:g} beta={self.beta:g}"
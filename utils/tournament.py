@@ -0,0 +1,486 @@
+# utils/tournament.py
+# Shared game loop and a process-parallel tournament runner for GoEngine matches.
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from go_core.board import Board, BLACK, WHITE, PASS_MOVE
+from utils.sgf_writer import moves_to_sgf
+from utils.sprt import SPRT, SPRTResult, EloEstimate, elo_estimate
+
+
+class EngineSpec(NamedTuple):
+    """
+    Picklable recipe for an engine, built inside the worker processes.
+
+    kind: "baseline", "katago", "katago-analysis" or "elf"
+    params: keyword arguments of the engine class
+    max_concurrent: most instances of this engine (GTP processes, loaded
+                    models) alive at once, and so most games it plays at
+                    once; None for no limit. A limited engine stays alive
+                    in the few workers that built it and its games are
+                    scheduled on those workers.
+    """
+
+    label: str
+    kind: str
+    params: Dict = {}
+    max_concurrent: Optional[int] = None
+
+
+def make_engine(spec: EngineSpec, komi: float = 7.5):
+    """Build the engine of `spec`, set up to play (and score rollouts) with `komi`."""
+    if spec.kind == "baseline":
+        from engines.baseline_mcts_engine import BaselineMCTSEngine
+
+        return BaselineMCTSEngine(komi=komi, **spec.params)
+    if spec.kind == "katago":
+        from engines.katago_engine import KataGoEngine
+
+        return KataGoEngine(komi=komi, **spec.params)
+    if spec.kind == "katago-analysis":
+        from engines.katago_analysis import KataGoAnalysis, KataGoAnalysisEngine
+
+        params = dict(spec.params)
+        analysis = KataGoAnalysis(params.pop("model_path"), params.pop("config_path"))
+        return KataGoAnalysisEngine(analysis, label=spec.label, komi=komi, **params)
+    if spec.kind == "elf":
+        from engines.elf_engine import ELFOpenGoEngine
+
+        if komi != ELFOpenGoEngine.komi:
+            raise ValueError(f"ELF OpenGo only plays with komi {ELFOpenGoEngine.komi:g}.")
+        return ELFOpenGoEngine(**spec.params)
+    raise ValueError(f"Unknown engine kind {spec.kind!r}.")
+
+
+def parse_spec(text: str) -> EngineSpec:
+    """
+    Parse "label=kind:key=value,key=value" (label optional), e.g.
+    "fast=baseline:simulations=200,playout=light" or
+    "strong=katago:model_path=m.bin.gz,config_path=gtp.cfg,max_concurrent=2".
+    Values are read as int, float or bool where possible.
+    """
+    label, _, rest = text.partition("=") if "=" in text.split(":", 1)[0] else ("", "", text)
+    kind, _, args = rest.partition(":")
+    params = {}
+    for item in filter(None, args.split(",")):
+        key, _, value = item.partition("=")
+        params[key.strip()] = _parse_value(value.strip())
+    max_concurrent = params.pop("max_concurrent", None)
+    return EngineSpec(label or kind, kind, params, max_concurrent)
+
+
+def _parse_value(value: str):
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+# ------------- single game -------------
+
+
+class GameResult(NamedTuple):
+    moves: List[Tuple[int, object]]  # (player, move), opening included
+    black_score: float
+    white_score: float
+    winner: int  # BLACK, WHITE or 0 for a draw
+
+    @property
+    def result_string(self) -> str:
+        """SGF RE value, e.g. "B+3.5", "W+0.5" or "0" for a draw."""
+        if not self.winner:
+            return "0"
+        margin = abs(self.black_score - self.white_score)
+        return f"{'B' if self.winner == BLACK else 'W'}+{margin:g}"
+
+
+def play_game(
+    black,
+    white,
+    board_size: int = 19,
+    komi: float = 7.5,
+    opening: Sequence = (),
+    max_moves: Optional[int] = None,
+    verbose: bool = False,
+    allow_ponder: bool = False,
+) -> GameResult:
+    """
+    Play one game between two GoEngines until two consecutive passes (or
+    `max_moves` moves) and score it with Tromp–Taylor. `opening` is a list
+    of moves, as (r, c) / PASS_MOVE or coordinates like "D4", played first.
+
+    A pondering engine is refused against an opponent that also searches
+    in this process, since its ponder thread would take the opponent's
+    CPU; pass `allow_ponder=True` to play such a game anyway. Engines
+    with a `komi` attribute must have been built for the game's `komi`.
+    """
+    for engine in (black, white):
+        engine_komi = getattr(engine, "komi", komi)
+        if engine_komi != komi:
+            raise ValueError(f"{engine.name()} is set up for komi {engine_komi:g}, the game has komi {komi:g}.")
+    if not allow_ponder:
+        for engine, opponent in ((black, white), (white, black)):
+            if getattr(engine, "ponder", False) is True and getattr(opponent, "in_process", True):
+                raise ValueError(
+                    f"{engine.name()} ponders against the in-process {opponent.name()}; "
+                    "pass allow_ponder=True to allow it."
+                )
+
+    board = Board(board_size)
+    moves = []
+    for mv in opening:
+        if isinstance(mv, str):
+            mv = board.from_coord(mv)
+        player = board.to_play
+        if not board.play(mv):
+            raise ValueError(f"Illegal opening move {mv!r}.")
+        moves.append((player, mv))
+
+    black.on_game_start(board)
+    white.on_game_start(board)
+    passes = 0
+    move_no = len(moves) + 1
+    while passes < 2 and (max_moves is None or len(moves) < max_moves):
+        engine = black if board.to_play == BLACK else white
+        player = board.to_play
+        mv = engine.genmove(board)
+        if not board.play(mv):
+            raise RuntimeError(f"{engine.name()} played an illegal move {mv!r}.")
+
+        color_char = "B" if player == BLACK else "W"
+        if verbose:
+            if mv is PASS_MOVE:
+                print(f"{move_no:03d} {color_char}: PASS")
+            else:
+                print(f"{move_no:03d} {color_char}: {board.to_coord(*mv)}")
+
+        moves.append((player, mv))
+        move_no += 1
+        passes = passes + 1 if mv is PASS_MOVE else 0
+
+    bs, ws = board.score_tromp_taylor(komi=komi)
+    winner = 0 if abs(bs - ws) < 1e-6 else (BLACK if bs > ws else WHITE)
+    result = GameResult(moves, bs, ws, winner)
+    black.on_game_end(board, result)
+    white.on_game_end(board, result)
+
+    if verbose:
+        print(f"Final Score — Black: {bs:.1f}, White: {ws:.1f} (komi {komi})")
+        if not winner:
+            print("Result: Draw")
+        elif winner == BLACK:
+            print(f"Result: Black ({black.name()}) wins")
+        else:
+            print(f"Result: White ({white.name()}) wins")
+    return result
+
+
+# ------------- tournament -------------
+
+
+class GameRecord(NamedTuple):
+    game: int  # 1-based game number
+    black: str  # engine labels
+    white: str
+    winner: Optional[str]  # label of the winner, None for a draw or an error
+    result: str  # SGF RE value, or "error"
+    moves: int
+    sgf: Optional[str]  # file name inside the output directory
+    seconds: float
+    error: Optional[str] = None
+
+
+class MatchSummary(NamedTuple):
+    a: str
+    b: str
+    wins_a: int
+    wins_b: int
+    draws: int
+    errors: int
+    sprt: Optional[SPRTResult] = None  # running test of a vs b, if one was requested
+
+    @property
+    def games(self) -> int:
+        return self.wins_a + self.wins_b + self.draws
+
+    def elo(self, confidence: float = 0.95) -> EloEstimate:
+        """Elo of a relative to b with a confidence interval."""
+        return elo_estimate(self.wins_a, self.draws, self.wins_b, confidence)
+
+
+# Engines are kept alive in their worker process, so their model is loaded
+# once per process rather than once per game
+_WORKER_ENGINES: Dict[tuple, object] = {}
+
+
+def _spec_key(spec: EngineSpec, komi: float) -> tuple:
+    return spec.label, spec.kind, tuple(sorted(spec.params.items())), komi
+
+
+def _worker_engine(spec: EngineSpec, komi: float):
+    key = _spec_key(spec, komi)
+    engine = _WORKER_ENGINES.get(key)
+    if engine is None:
+        engine = _WORKER_ENGINES[key] = make_engine(spec, komi)
+    return engine
+
+
+def _close_engines(labels: Sequence[str]) -> None:
+    """Close this worker's engines with the given labels (to free a limited slot)."""
+    for key in [k for k in _WORKER_ENGINES if k[0] in labels]:
+        close = getattr(_WORKER_ENGINES.pop(key), "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass  # the engine is dropped either way
+
+
+def _run_game(job) -> Tuple[int, Optional[GameResult], float, Optional[str]]:
+    game_no, black_spec, white_spec, opening, settings = job
+    start = time.perf_counter()
+    try:
+        black = _worker_engine(black_spec, settings["komi"])
+        white = _worker_engine(white_spec, settings["komi"])
+        result = play_game(black, white, opening=opening, **settings)
+    except Exception as exc:  # recorded, the tournament goes on
+        return game_no, None, time.perf_counter() - start, f"{type(exc).__name__}: {exc}"
+    return game_no, result, time.perf_counter() - start, None
+
+
+class _Lanes:
+    """
+    Single-process executors with a record of the limited engines each one
+    holds. A game with a limited engine goes to a lane that already holds
+    it, or to one that may build it without exceeding max_concurrent; when
+    the engine is at its limit, it is first closed in another idle lane.
+    """
+
+    def __init__(self, count: int, limits: Dict[str, Optional[int]]):
+        self.executors = [ProcessPoolExecutor(max_workers=1) for _ in range(count)]
+        self.limits = limits
+        self.held: List[set] = [set() for _ in range(count)]
+        self.busy = [False] * count
+
+    def holders(self, label: str) -> List[int]:
+        return [i for i, held in enumerate(self.held) if label in held]
+
+    def place(self, job) -> Optional[Tuple[int, Dict[int, List[str]]]]:
+        """
+        (lane, {idle lane: labels to close there}) for `job`, or None to
+        wait. The job can only start once there is nothing to close.
+        """
+        labels = {s.label for s in (job[1], job[2]) if self.limits[s.label] is not None}
+        idle = [i for i, busy in enumerate(self.busy) if not busy]
+        for lane in sorted(idle, key=lambda i: len(labels - self.held[i])):
+            evict: Dict[int, List[str]] = {}
+            for label in labels - self.held[lane]:
+                holders = self.holders(label)
+                if len(holders) < self.limits[label]:
+                    continue
+                victim = next((i for i in holders if i != lane and not self.busy[i]), None)
+                if victim is None:
+                    break
+                evict.setdefault(victim, []).append(label)
+            else:
+                return lane, evict
+        return None
+
+    def submit(self, lane: int, fn, *args):
+        self.busy[lane] = True
+        return self.executors[lane].submit(fn, *args)
+
+    def __enter__(self) -> "_Lanes":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for executor in self.executors:
+            executor.shutdown()
+
+
+def run_match(
+    engine_a: EngineSpec,
+    engine_b: EngineSpec,
+    games: int,
+    out_dir: str,
+    openings: Sequence[Sequence] = (),
+    alternate_colors: bool = True,
+    workers: Optional[int] = None,
+    board_size: int = 19,
+    komi: float = 7.5,
+    max_moves: Optional[int] = None,
+    on_game: Optional[Callable[[GameRecord, MatchSummary], bool]] = None,
+    title: Optional[str] = None,
+    sprt: Optional[SPRT] = None,
+) -> MatchSummary:
+    """
+    Play `games` games of engine_a vs engine_b on a process pool.
+
+    With `alternate_colors` engine_a takes black in odd-numbered games and
+    white in even ones; opening k is used for games 2k+1 and 2k+2 (cycling
+    through `openings`) so each opening is played with both colors. Each of
+    the `workers` processes plays one game at a time and keeps its engines
+    between games; an engine with max_concurrent lives in at most that
+    many workers.
+
+    Writes game_NNN.sgf, results.jsonl (one GameRecord per line, in
+    completion order) and summary.txt to `out_dir`. `on_game` is called
+    after every finished game with its record and the running summary;
+    returning True stops scheduling new games (running ones still finish).
+
+    With an `sprt` (hypotheses about engine_a's Elo over engine_b), the
+    match also stops as soon as the test accepts H0 or H1; `games` is then
+    only the upper bound. Games already running when it stops still count.
+    """
+    if engine_a.label == engine_b.label:
+        raise ValueError("The two engines need different labels.")
+    os.makedirs(out_dir, exist_ok=True)
+    settings = dict(board_size=board_size, komi=komi, max_moves=max_moves)
+
+    jobs = []
+    for i in range(games):
+        swap = alternate_colors and i % 2 == 1
+        black, white = (engine_b, engine_a) if swap else (engine_a, engine_b)
+        opening = openings[(i // 2 if alternate_colors else i) % len(openings)] if openings else ()
+        jobs.append((i + 1, black, white, tuple(opening), settings))
+
+    limits = {s.label: s.max_concurrent for s in (engine_a, engine_b)}
+    counts = {"a": 0, "b": 0, "draws": 0, "errors": 0}
+
+    def summary() -> MatchSummary:
+        test = sprt.test(counts["a"], counts["draws"], counts["b"]) if sprt is not None else None
+        return MatchSummary(
+            engine_a.label, engine_b.label, counts["a"], counts["b"], counts["draws"], counts["errors"], test
+        )
+
+    results_path = os.path.join(out_dir, "results.jsonl")
+    stop = False
+    lanes = _Lanes(workers or os.cpu_count() or 1, limits)
+    with lanes, open(results_path, "w", encoding="utf-8") as log:
+        in_flight = {}  # future -> (lane, job or labels being closed)
+        while jobs or in_flight:
+            while not stop and jobs:
+                placed = next(((j, p) for j in jobs for p in [lanes.place(j)] if p is not None), None)
+                if placed is None:
+                    break
+                job, (lane, evict) = placed
+                if evict:
+                    # Still counted as held until closed, so the limit is never exceeded
+                    for victim, labels in evict.items():
+                        in_flight[lanes.submit(victim, _close_engines, labels)] = (victim, labels)
+                    break  # place again once they are closed
+                jobs.remove(job)
+                lanes.held[lane].update(s.label for s in (job[1], job[2]) if limits[s.label] is not None)
+                in_flight[lanes.submit(lane, _run_game, job)] = (lane, job)
+            if stop:
+                jobs.clear()
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                lane, job = in_flight.pop(future)
+                lanes.busy[lane] = False
+                if isinstance(job, list):
+                    lanes.held[lane].difference_update(job)
+                    continue
+                record = _record(job, *future.result(), out_dir=out_dir, komi=komi)
+                if record.error is not None:
+                    counts["errors"] += 1
+                elif record.winner is None:
+                    counts["draws"] += 1
+                else:
+                    counts["a" if record.winner == engine_a.label else "b"] += 1
+                log.write(json.dumps(record._asdict()) + "\n")
+                log.flush()
+                current = summary()
+                if on_game is not None and on_game(record, current):
+                    stop = True
+                if current.sprt is not None and current.sprt.decision is not None:
+                    stop = True
+
+    result = summary()
+    with open(os.path.join(out_dir, "summary.txt"), "w", encoding="utf-8") as f:
+        f.write(format_summary(result, engine_a, engine_b, board_size, komi, title, sprt))
+    return result
+
+
+def _record(job, game_no, result, seconds, error, out_dir: str, komi: float) -> GameRecord:
+    _, black, white, _, settings = job
+    if result is None:
+        return GameRecord(game_no, black.label, white.label, None, "error", 0, None, seconds, error)
+    sgf_name = f"game_{game_no:03d}.sgf"
+    with open(os.path.join(out_dir, sgf_name), "w", encoding="utf-8") as f:
+        f.write(
+            moves_to_sgf(
+                result.moves,
+                board_size=settings["board_size"],
+                black=black.label,
+                white=white.label,
+                result=result.result_string,
+                komi=komi,
+            )
+        )
+    winner = None
+    if result.winner:
+        winner = black.label if result.winner == BLACK else white.label
+    return GameRecord(
+        game_no, black.label, white.label, winner, result.result_string, len(result.moves), sgf_name, seconds
+    )
+
+
+def format_summary(
+    summary: MatchSummary,
+    engine_a: EngineSpec,
+    engine_b: EngineSpec,
+    board_size: int = 19,
+    komi: float = 7.5,
+    title: Optional[str] = None,
+    sprt: Optional[SPRT] = None,
+) -> str:
+    """summary.txt-style report of a finished match."""
+    a, b = summary.a, summary.b
+    width = max(len(a), len(b))
+    lines = [
+        f"{title or f'{a} vs {b}'} — Evaluation Summary",
+        f"Board Size: {board_size}x{board_size}",
+        f"Rules: Tromp-Taylor, Komi {komi:g}",
+        f"Number of Games: {summary.games}",
+        "Engines:",
+        f"  - {a + ':':<{width + 1}} {engine_a.kind} {_format_params(engine_a.params)}".rstrip(),
+        f"  - {b + ':':<{width + 1}} {engine_b.kind} {_format_params(engine_b.params)}".rstrip(),
+        "",
+        "Final Results:",
+        f"  {a} Wins: {summary.wins_a:>{len(str(summary.games))}}",
+        f"  {b} Wins: {summary.wins_b:>{len(str(summary.games))}}",
+    ]
+    if summary.draws:
+        lines.append(f"  Draws: {summary.draws}")
+    if summary.games:
+        rate = (summary.wins_a + 0.5 * summary.draws) / summary.games
+        lines.append(f"  Win Rate ({a}):  {rate:.0%}")
+        lines.append(f"  Elo ({a} - {b}): {summary.elo()} (95% CI)")
+    if sprt is not None and summary.sprt is not None:
+        test = summary.sprt
+        verdict = {"H1": f"accepted H1 (elo >= {sprt.elo1:g})", "H0": f"accepted H0 (elo <= {sprt.elo0:g})"}
+        lines.append(
+            f"  {sprt}: {verdict.get(test.decision, 'undecided')}, "
+            f"LLR {test.llr:.2f} in [{test.lower:.2f}, {test.upper:.2f}]"
+        )
+    if summary.errors:
+        lines.append(f"  Games aborted by errors: {summary.errors} (see results.jsonl)")
+    lines.append("")
+    if summary.games:
+        lines.append("All SGF game files (game_NNN.sgf) are included in this directory.")
+    return "\n".join(lines) + "\n"
+
+
+def _format_params(params: Dict) -> str:
+    return ", ".join(f"{k}={v}" for k, v in params.items())